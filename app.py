@@ -2,24 +2,35 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import requests
-import feedparser
-import yfinance as yf
 import random
+from array import array
 from datetime import datetime, timedelta
 import smtplib
 from email.mime.text import MIMEText
+import io
 import os
+import json
+import glob
+import hashlib
+import time
+import threading
+import queue
+import re
+import heapq
+import contextlib
+import functools
+from collections import Counter, deque
+from urllib.parse import quote
+import sqlite3
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 import streamlit.components.v1 as components
+from sortedcontainers import SortedList
 
 # -----------------------------------------------------------------------------
-# [0] 페이지 설정 및 사장님 정보 (여기에 고정했습니다!)
+# [0] 사장님 정보 (여기에 고정했습니다!)
 # -----------------------------------------------------------------------------
-st.set_page_config(
-    page_title="사장님 비서",
-    page_icon="🥕",
-    layout="wide",
-    initial_sidebar_state="collapsed"
-)
 
 # 🔐 관리자 비밀번호
 ADMIN_PW = "7777" 
@@ -43,11 +54,14 @@ def set_style():
         .finance-title { font-size: 0.8rem; color: #666; font-weight: bold; }
         .finance-val { font-size: 1.1rem; font-weight: bold; color: #333; }
         .finance-change { font-size: 0.8rem; font-weight: bold; }
+        .finance-trend { font-size: 0.75rem; color: #666; margin-top: 2px; }
+        .finance-spark { width: 100%; height: 28px; margin-top: 4px; }
         
         .news-box { background-color: white; padding: 15px; border-radius: 10px; border-left: 5px solid #ff6f0f; margin-bottom: 20px; }
         .news-item { padding: 8px 0; border-bottom: 1px solid #eee; }
         .news-item a { text-decoration: none; color: #333; font-weight: bold; font-size: 1rem; }
         .news-date { font-size: 0.8rem; color: #ff6f0f; margin-left: 5px; }
+        .news-tag { font-size: 0.7rem; color: #ff6f0f; background-color: #fff3eb; border-radius: 8px; padding: 1px 6px; margin-left: 4px; }
         .news-update-time { font-size: 0.8rem; color: #888; text-align: right; margin-top: 5px; }
         
         .stButton>button { background-color: #ff6f0f; color: white; border-radius: 8px; font-weight: bold; width: 100%; height: 45px; border: none; }
@@ -108,247 +122,1656 @@ def set_style():
 # -----------------------------------------------------------------------------
 # [기능 2] 메일 전송
 # -----------------------------------------------------------------------------
+# 신청서는 outbox 폴더에 파일로 먼저 저장해서(유실 방지) 화면은 바로 돌려주고,
+# 백그라운드 발송기가 로그인된 SMTP 연결을 재사용하며 모아서 보냅니다. 실패하면 점점 길게 기다렸다 재시도합니다.
+# 프로세스가 여러 개면 발송기도 여러 개라, 보내기 전에 파일 이름을 ".sending.<pid>.<스레드>" 로 바꿔(원자적) 한 곳만 가져가게 합니다.
+# 가져간 프로세스가 죽어서 남은 파일은 다른 발송기가, 같은 pid 로 재시작했으면 지금 보내는 중이 아닌 것을 자신이 원래 이름으로 되돌립니다.
+OUTBOX_DIR = "mail_outbox"
+OUTBOX_BATCH = 20
+OUTBOX_IDLE_SECONDS = 60
+OUTBOX_BASE_BACKOFF = 30
+OUTBOX_MAX_BACKOFF = 3600
+
+def get_smtp_config():
+    if "smtp" not in st.secrets: return None
+    conf = st.secrets["smtp"]
+    return (conf.get("host", "smtp.gmail.com"), int(conf.get("port", 587)), conf.get("email", ""), conf.get("password", ""), bool(conf.get("starttls", True)))
+
+def smtp_connect(host, port, sender, pw, starttls):
+    server = smtplib.SMTP(host, port, timeout=10)
+    if starttls: server.starttls()
+    if pw: server.login(sender, pw)
+    return server
+
+def pid_alive(pid):
+    if os.name == "nt": return True  # 윈도우의 os.kill 은 프로세스를 끝내 버립니다.
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except: pass
+    return True
+
+@st.cache_resource
+def get_outbox_claims():
+    return set()  # 이 프로세스에서 지금 보내는 중인 파일
+
+def recover_outbox_claims():
+    sending = get_outbox_claims()
+    for claimed in glob.glob(os.path.join(OUTBOX_DIR, "*.json.sending.*")):
+        path, _, owner = claimed.rpartition(".sending.")
+        try:
+            pid = int(owner.split(".")[0])
+            stale = claimed not in sending if pid == os.getpid() else not pid_alive(pid)
+            if stale: os.replace(claimed, path)
+        except: pass
+
+def mail_worker(worker):
+    host, port, sender, pw, starttls = worker["config"]
+    server, last_used = None, 0
+    sending = get_outbox_claims()
+    while True:
+        wait = OUTBOX_BASE_BACKOFF
+        now = time.time()
+        recover_outbox_claims()
+        due, failed = [], False
+        for path in sorted(glob.glob(os.path.join(OUTBOX_DIR, "*.json"))):
+            try:
+                with open(perf_read(path), "r", encoding="utf-8") as f: msg = json.load(f)
+            except: continue
+            if msg["next_try"] <= now: due.append((path, msg))
+            else: wait = min(wait, msg["next_try"] - now)
+            if len(due) >= OUTBOX_BATCH: break
+        for path, msg in due:
+            claimed = f"{path}.sending.{os.getpid()}.{threading.get_ident()}"
+            sending.add(claimed)  # 이름을 바꾸기 전에 넣어야 같은 프로세스의 다른 발송기가 남은 파일로 보지 않습니다.
+            try:
+                os.rename(path, claimed)  # 다른 발송기가 먼저 가져갔으면 실패
+                with open(claimed, "r", encoding="utf-8") as f: msg = json.load(f)
+            except:
+                sending.discard(claimed)
+                continue
+            mime = MIMEText(msg["body"])
+            mime['Subject'] = msg["subject"]
+            mime['From'] = sender
+            mime['To'] = sender
+            try:
+                if server is None:
+                    with perf_span("외부", "SMTP 연결"): server = smtp_connect(host, port, sender, pw, starttls)
+                with perf_span("외부", "SMTP 발송"): server.sendmail(sender, sender, mime.as_string())
+            except Exception as e:
+                try: server.close()
+                except: pass
+                server = None
+                msg["attempts"] += 1
+                msg["next_try"] = time.time() + min(OUTBOX_MAX_BACKOFF, OUTBOX_BASE_BACKOFF * 2 ** (msg["attempts"] - 1))
+                msg["error"] = str(e)
+                write_json_atomic(path, msg)
+                try: os.remove(claimed)
+                except: pass
+                sending.discard(claimed)
+                failed = True
+                break  # 서버 문제면 나머지도 실패하므로 다음 차례로 미룹니다.
+            last_used = time.time()
+            try: os.remove(claimed)  # 이미 보낸 메일은 지우기에 실패해도 실패로 다시 쓰지 않습니다.
+            except: pass
+            else: sending.discard(claimed)
+        if server is not None and time.time() - last_used > OUTBOX_IDLE_SECONDS:
+            try: server.quit()
+            except: pass
+            server = None
+        if len(due) >= OUTBOX_BATCH and not failed: continue  # 밀린 메일은 쉬지 않고 보내되, 실패했으면 기다립니다.
+        worker["wake"].wait(timeout=max(0.1, wait))
+        worker["wake"].clear()
+
+@st.cache_resource
+def get_mail_worker(config):
+    os.makedirs(OUTBOX_DIR, exist_ok=True)
+    worker = {"config": config, "wake": threading.Event()}
+    threading.Thread(target=mail_worker, args=(worker,), daemon=True).start()
+    return worker
+
 def send_email_safe(name, phone, client_email, req_text, type_tag):
-    if "smtp" not in st.secrets: return False, "설정 오류"
-    sender = st.secrets["smtp"].get("email", "")
-    pw = st.secrets["smtp"].get("password", "")
+    config = get_smtp_config()
+    if config is None: return False, "설정 오류"
     store = st.session_state.get('store_name', '미로그인')
     subject = f"🔔 [사장님 비서] {name}님 {type_tag} ({store})"
     body = f"매장: {store}\n이름: {name}\n연락처: {phone}\n내용: {req_text}"
-    msg = MIMEText(body)
-    msg['Subject'] = subject
-    msg['From'] = sender
-    msg['To'] = sender 
     try:
-        with smtplib.SMTP('smtp.gmail.com', 587, timeout=10) as server:
-            server.starttls()
-            server.login(sender, pw)
-            server.sendmail(sender, sender, msg.as_string())
+        worker = get_mail_worker(config)
+        write_json_atomic(os.path.join(OUTBOX_DIR, f"{time.time_ns()}-{os.urandom(3).hex()}.json"), {"subject": subject, "body": body, "attempts": 0, "next_try": 0})
+        worker["wake"].set()
         return True, "성공"
     except Exception as e: return False, str(e)
 
 # -----------------------------------------------------------------------------
 # [기능 3] 데이터 엔진
 # -----------------------------------------------------------------------------
-@st.cache_data(ttl=1800)
-def get_finance_data():
+# 성능 계측 - 데이터 함수/탭 화면/외부 호출(yfinance, RSS, SMTP)의 걸린 시간을 이름별 최근 PERF_SAMPLES 개씩,
+# rerun(전체 실행 또는 탭 조각 실행)마다 그 안에서 잰 구간 목록을, 파일별 읽고 쓴 바이트를 메모리에 둡니다.
+# 기록은 perf_counter 두 번과 목록 추가뿐이고, 백분위수 계산과 표는 관리자 성능 패널을 켰을 때만 만듭니다.
+# DOHA_PERF=0 이면 아예 재지 않습니다.
+PERF_ENABLED = os.environ.get("DOHA_PERF", "1") != "0"
+PERF_SAMPLES = 500
+PERF_RERUNS = 200
+
+@st.cache_resource
+def get_perf_state():
+    return {"lock": threading.Lock(), "local": threading.local(), "spans": {}, "reruns": deque(maxlen=PERF_RERUNS), "io": {}}
+PERF_STATE = get_perf_state()  # 구간마다 cache_resource 를 조회하지 않도록 스크립트 실행마다 한 번 잡아 둡니다.
+
+def perf_record(kind, name, ms):
+    state = PERF_STATE
+    with state["lock"]:
+        samples = state["spans"].get((kind, name))
+        if samples is None: samples = state["spans"][(kind, name)] = deque(maxlen=PERF_SAMPLES)
+        samples.append(ms)
+    spans = getattr(state["local"], "spans", None)  # 지금 스레드에서 진행 중인 rerun 이 있으면 거기에도 남김
+    if spans is not None: spans.append((kind, name, ms))
+
+@contextlib.contextmanager
+def perf_span(kind, name):
+    if not PERF_ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try: yield
+    finally: perf_record(kind, name, (time.perf_counter() - t0) * 1000)
+
+def perf_timed(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with perf_span("데이터", func.__name__): return func(*args, **kwargs)
+    return wrapper
+
+# rerun 하나 - main() 전체 실행이나, 탭 안의 입력으로 그 탭(fragment)만 다시 실행되는 경우입니다.
+@contextlib.contextmanager
+def perf_rerun(kind):
+    if not PERF_ENABLED:
+        yield
+        return
+    state = PERF_STATE
+    state["local"].spans = spans = []
+    t0 = time.perf_counter()
+    try: yield
+    finally:
+        total = (time.perf_counter() - t0) * 1000
+        state["local"].spans = None
+        with state["lock"]: state["reruns"].append({"time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "kind": kind, "ms": total, "spans": spans})
+
+# 탭 화면 - 전체 실행 안에서는 구간 하나, 탭만 다시 실행될 때는 그 자체가 rerun 하나입니다.
+def perf_tab(func):
+    @functools.wraps(func)
+    def wrapper():
+        if getattr(PERF_STATE["local"], "spans", None) is not None:
+            with perf_span("화면", func.__name__): return func()
+        with perf_rerun(f"탭 {func.__name__}"), perf_span("화면", func.__name__): return func()
+    return wrapper
+
+def file_size(path):
+    try: return os.path.getsize(path)
+    except OSError: return 0
+
+# 파일별 [읽은 바이트, 쓴 바이트, 읽기 횟수, 쓰기 횟수]. 메일 outbox 처럼 이름이 매번 다른 파일은 폴더 하나로 묶습니다.
+def perf_io(path, read=0, written=0):
+    if not PERF_ENABLED: return
+    if os.path.dirname(path) == OUTBOX_DIR: path = os.path.join(OUTBOX_DIR, "*.json")
+    state = PERF_STATE
+    with state["lock"]:
+        io_stats = state["io"].setdefault(path, [0, 0, 0, 0])
+        io_stats[0] += read
+        io_stats[1] += written
+        io_stats[2] += read > 0
+        io_stats[3] += written > 0
+
+# 읽기 직전에 부르고 경로를 그대로 돌려주므로 pd.read_csv(perf_read(path)) 처럼 씁니다.
+def perf_read(path):
+    if PERF_ENABLED: perf_io(path, read=file_size(path))
+    return path
+
+# 쓴 뒤에 부릅니다. 이어 쓰기면 쓰기 전 크기(before)를 넘깁니다.
+def perf_wrote(path, before=0):
+    if PERF_ENABLED: perf_io(path, written=max(file_size(path) - before, 0))
+
+def perf_percentiles():
+    state = PERF_STATE
+    with state["lock"]: spans = {k: np.array(v) for k, v in state["spans"].items()}
+    rows = [{"종류": kind, "이름": name, "횟수": len(v), "p50(ms)": np.percentile(v, 50), "p95(ms)": np.percentile(v, 95),
+             "p99(ms)": np.percentile(v, 99), "최대(ms)": v.max()} for (kind, name), v in spans.items()]
+    df = pd.DataFrame(rows, columns=["종류", "이름", "횟수", "p50(ms)", "p95(ms)", "p99(ms)", "최대(ms)"])
+    return df.sort_values("p95(ms)", ascending=False).round(2)
+
+def perf_slowest_reruns(k=10):
+    state = PERF_STATE
+    with state["lock"]: reruns = list(state["reruns"])
+    rows = []
+    for r in sorted(reruns, key=lambda r: r["ms"], reverse=True)[:k]:
+        top = sorted(r["spans"], key=lambda s: s[2], reverse=True)[:3]
+        rows.append({"시각": r["time"], "실행": r["kind"], "전체(ms)": round(r["ms"], 1),
+                     "오래 걸린 구간": ", ".join(f"{name} {ms:.0f}ms" for _, name, ms in top)})
+    return pd.DataFrame(rows, columns=["시각", "실행", "전체(ms)", "오래 걸린 구간"])
+
+def perf_io_stats():
+    state = PERF_STATE
+    with state["lock"]: rows = [(path, *v) for path, v in state["io"].items()]
+    df = pd.DataFrame(rows, columns=["파일", "읽은 바이트", "쓴 바이트", "읽기", "쓰기"])
+    return df.sort_values(["읽은 바이트", "쓴 바이트"], ascending=False)
+
+# 내보내기 - 한 줄에 JSON 하나: rerun(구간 포함), 이름별 백분위수, 파일 입출력, 파일 캐시 hit/miss.
+def perf_export_jsonl():
+    state = PERF_STATE
+    with state["lock"]: reruns = list(state["reruns"])
+    lines = [{"type": "rerun", **r, "spans": [{"kind": k, "name": n, "ms": ms} for k, n, ms in r["spans"]]} for r in reruns]
+    lines += [{"type": "span", **row} for row in perf_percentiles().to_dict("records")]
+    lines += [{"type": "io", **row} for row in perf_io_stats().to_dict("records")]
+    lines += [{"type": "cache", **row} for row in file_cache_stats().to_dict("records")]
+    return "".join(json.dumps(line, ensure_ascii=False, default=str) + "\n" for line in lines).encode("utf-8")
+
+def perf_reset():
+    state = PERF_STATE
+    with state["lock"]:
+        state["spans"].clear()
+        state["reruns"].clear()
+        state["io"].clear()
+
+# JSON 파일은 임시 파일에 쓴 뒤 교체해서, 읽는 쪽이 반쯤 쓴 파일을 보지 않게 합니다.
+# 임시 파일 이름에 프로세스/스레드를 넣어서, 같은 파일을 동시에 쓰는 쪽끼리 임시 파일을 덮어쓰지 않습니다.
+def temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def write_json_atomic(path, obj):
+    tmp = temp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    perf_wrote(path)
+
+# 파일 캐시 - load_* 가 매 rerun 마다 같은 파일을 다시 파싱하지 않도록, 파일 상태(mtime, 크기)와
+# 쓰기 버전이 그대로면 메모리 값을 돌려줍니다. 확인 비용은 stat 한 번이고, save_* 는 쓴 뒤 버전을 올립니다.
+# 돌려준 DataFrame 은 여러 세션이 함께 쓰므로 제자리에서 고치면 안 됩니다.
+@st.cache_resource
+def get_file_cache():
+    return {"lock": threading.Lock(), "entries": {}, "parts": {}, "versions": {}, "stats": {}}
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError: return None
+
+# part 를 주면 같은 데이터(key)의 부분 조회를 따로 캐시하되, 버전/서명은 key 하나로 같이 무효화됩니다.
+# 부분 조회는 key 마다 최근에 쓴 FILE_CACHE_PARTS 개까지만 두고, 서명이 바뀌면 예전 서명의 부분 조회는 바로 버립니다.
+FILE_CACHE_PARTS = 8
+
+def cached_load(key, path, loader, part=None):
+    cache = get_file_cache()
+    entry_key = key if part is None else f"{key} {part}"
+    sig = cache_signature(key, path)
+    with cache["lock"]:
+        entry = cache["entries"].get(entry_key)
+        stats = cache["stats"].setdefault(entry_key, {"hit": 0, "miss": 0})
+        if entry is not None and entry[0] == sig:
+            stats["hit"] += 1
+            if part is not None: cache["parts"][key][entry_key] = cache["parts"][key].pop(entry_key)
+            return entry[1]
+        stats["miss"] += 1
+    value = loader()
+    with cache["lock"]:
+        cache["entries"][entry_key] = (sig, value)
+        if part is not None:
+            parts = cache["parts"].setdefault(key, {})
+            parts.pop(entry_key, None)
+            parts[entry_key] = None
+            stale = [k for k in parts if cache["entries"][k][0] != sig]
+            stale += [k for k in parts if k not in stale][:max(0, len(parts) - len(stale) - FILE_CACHE_PARTS)]
+            for k in stale:
+                del parts[k]
+                cache["entries"].pop(k, None)
+    return value
+
+def cache_signature(key, path):
+    cache = get_file_cache()
+    with cache["lock"]: return cache["versions"].get(key, 0), storage_signature(key, path)
+
+def bump_file_version(key):
+    cache = get_file_cache()
+    with cache["lock"]: cache["versions"][key] = cache["versions"].get(key, 0) + 1
+
+def storage_signature(key, path):
+    return db_version(key) if STORAGE_BACKEND == "sqlite" else file_signature(path)
+
+def file_cache_stats():
+    cache = get_file_cache()
+    with cache["lock"]:
+        return pd.DataFrame([{"파일": k, "hit": v["hit"], "miss": v["miss"]} for k, v in cache["stats"].items()])
+
+# 저장소 - 기본은 CSV/텍스트 파일이고, DOHA_STORAGE=sqlite 면 SQLite(WAL)에 저장해서
+# 한 서버의 Streamlit 프로세스 여러 개가 같은 데이터를 잃어버리는 쓰기 없이 나눠 씁니다.
+# 쓰기는 프로세스마다 하나인 쓰기 스레드가 모아서 한 트랜잭션으로 커밋하고(group commit),
+# 같은 트랜잭션에서 바뀐 데이터의 버전(versions)을 올려 다른 프로세스의 캐시도 무효화합니다.
+STORAGE_BACKEND = os.environ.get("DOHA_STORAGE", "csv")
+DB_FILE = os.environ.get("DOHA_DB", "doha.db")
+DB_GROUP_COMMIT_MAX = 256
+DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS visitors (seq INTEGER PRIMARY KEY, timestamp TEXT, date TEXT);
+CREATE TABLE IF NOT EXISTS visitor_rollup (kind TEXT, key TEXT, count INTEGER NOT NULL, PRIMARY KEY (kind, key));
+CREATE TABLE IF NOT EXISTS ledger_entries (id INTEGER PRIMARY KEY, store TEXT NOT NULL, seq INTEGER NOT NULL, date TEXT, type TEXT, item TEXT, amount INTEGER, memo TEXT, UNIQUE (store, seq));
+CREATE INDEX IF NOT EXISTS ledger_entries_store_date ON ledger_entries (store, date);
+CREATE TABLE IF NOT EXISTS attendance (seq INTEGER PRIMARY KEY, store TEXT, time TEXT, name TEXT, action TEXT);
+CREATE INDEX IF NOT EXISTS attendance_store ON attendance (store, seq);
+CREATE TABLE IF NOT EXISTS game_rank (name TEXT PRIMARY KEY, score INTEGER, date TEXT);
+CREATE TABLE IF NOT EXISTS experts (seq INTEGER PRIMARY KEY, category TEXT, name TEXT, description TEXT, contact TEXT, location TEXT);
+"""
+VISITOR_ROLLUP_UPSERT = "INSERT INTO visitor_rollup (kind, key, count) VALUES (?, ?, 1) ON CONFLICT (kind, key) DO UPDATE SET count = count + 1"
+
+def db_connect():
+    conn = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+@st.cache_resource
+def init_db():
+    conn = db_connect()
+    conn.executescript(DB_SCHEMA)
+    conn.execute("BEGIN IMMEDIATE")
+    if conn.execute("SELECT 1 FROM kv WHERE key = 'files_imported'").fetchone() is None:
+        import_files_into_db(conn)
+        conn.execute("INSERT INTO kv (key, value) VALUES ('files_imported', ?)", (datetime.now().isoformat(),))
+    conn.execute("COMMIT")
+    conn.close()
+    return True
+
+# 처음 SQLite 로 바꿀 때 기존 CSV/텍스트 파일 데이터를 한 번 옮겨 담습니다. (예전 단일 장부는 migrate_legacy_ledger)
+def import_files_into_db(conn):
+    for path in glob.glob("log_*.csv"):
+        df = pd.read_csv(path).iloc[::-1]
+        conn.executemany("INSERT INTO attendance (store, time, name, action) VALUES (?, ?, ?, ?)",
+                         [(path[4:-4], *row) for row in df[["일시", "직원명", "구분"]].itertuples(index=False)])
+    # 가게별 장부(월 파티션 + 저널)는 seq 를 그대로 옮깁니다.
+    for path in glob.glob(os.path.join(LEDGER_DIR, "*", "")):
+        store = os.path.basename(os.path.dirname(path))
+        ledger = _read_ledger(store).reset_index().sort_values("seq")
+        ledger = ledger.assign(날짜=ledger['날짜'].dt.strftime("%Y-%m-%d"))[["seq"] + LEDGER_COLUMNS]
+        conn.executemany("INSERT INTO ledger_entries (store, seq, date, type, item, amount, memo) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         [(store, int(q), d, t, i, int(a), m) for q, d, t, i, a, m in ledger.astype(object).where(ledger.notna(), None).itertuples(index=False)])
+    board = _read_leaderboard_files()
+    conn.executemany("INSERT INTO game_rank (name, score, date) VALUES (?, ?, ?)", [(n, s, d) for n, (s, d) in board.items()])
+    experts = _read_experts().iloc[::-1].fillna("")
+    conn.executemany("INSERT INTO experts (category, name, description, contact, location) VALUES (?, ?, ?, ?, ?)",
+                     experts[["category", "name", "desc", "contact", "location"]].itertuples(index=False))
+    for key, path in [("notice", NOTICE_FILE), ("radio_url", RADIO_URL_FILE)]:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f: conn.execute("INSERT INTO kv (key, value) VALUES (?, ?)", (key, f.read()))
+    if os.path.exists(VISITOR_FILE):
+        visitors = pd.read_csv(VISITOR_FILE).sort_values("timestamp")
+        conn.executemany("INSERT INTO visitors (timestamp, date) VALUES (?, ?)", visitors[["timestamp", "date"]].itertuples(index=False))
+        conn.execute("""INSERT INTO visitor_rollup (kind, key, count)
+                        SELECT 'total', '', COUNT(*) FROM visitors
+                        UNION ALL SELECT 'daily', date, COUNT(*) FROM visitors GROUP BY date
+                        UNION ALL SELECT 'hourly', substr(timestamp, 12, 2), COUNT(*) FROM visitors GROUP BY 2""")
+
+def db_apply(conn, job):
+    for sql, params in job["ops"]: conn.execute(sql, params)
+    for name in job["names"]:
+        conn.execute("INSERT INTO versions (name, version) VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET version = version + 1", (name,))
+
+def db_writer_loop(writer):
+    conn = db_connect()
+    while True:
+        batch = [writer["queue"].get()]
+        while len(batch) < DB_GROUP_COMMIT_MAX and not writer["queue"].empty():
+            batch.append(writer["queue"].get())
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job in batch: db_apply(conn, job)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            # 묶음 커밋이 실패하면 하나씩 다시 커밋해서 문제 있는 쓰기만 실패로 돌려줍니다.
+            for job in batch:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    db_apply(conn, job)
+                    conn.execute("COMMIT")
+                except Exception as e:
+                    if conn.in_transaction: conn.execute("ROLLBACK")
+                    job["error"] = e
+        for job in batch: job["done"].set()
+
+@st.cache_resource
+def get_db_writer():
+    init_db()
+    writer = {"queue": queue.Queue()}
+    threading.Thread(target=db_writer_loop, args=(writer,), daemon=True).start()
+    return writer
+
+@perf_timed
+def db_write(ops, *names):
+    job = {"ops": ops, "names": names, "done": threading.Event(), "error": None}
+    get_db_writer()["queue"].put(job)
+    job["done"].wait()
+    if job["error"] is not None: raise job["error"]
+
+@st.cache_resource
+def get_db_local():
+    init_db()
+    return threading.local()
+
+def db_conn():
+    local = get_db_local()
+    if not hasattr(local, "conn"): local.conn = db_connect()
+    return local.conn
+
+@perf_timed
+def db_query(sql, params=()):
+    return pd.read_sql_query(sql, db_conn(), params=params)
+
+def db_version(name):
+    row = db_conn().execute("SELECT version FROM versions WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else 0
+
+# 경제 지표 - 티커별 일봉 종가를 로컬 시계열(market_history/<심볼>.parquet)에 쌓아 두고,
+# 새로 고칠 때는 마지막으로 저장된 날짜부터만 받아 붙입니다. (마지막 날 봉은 장중에 바뀌므로 다시 받아 덮어씀)
+# 현재가/등락, 1개월·1년 변동, 스파크라인은 로컬 시계열로 계산해서 요약(market_cache.json)에 둡니다.
+# 화면은 항상 저장된 요약을 바로 보여주고, 요약이 오래됐으면 백그라운드에서 새로 받아옵니다.
+# 프로세스가 여러 개(DOHA_STORAGE=sqlite)면 새로 고침도 프로세스마다 따로 돌아서 같은 시세를 여러 번 받을 수 있습니다.
+# 받는 양은 마지막 날짜 이후 며칠치뿐이고 파일은 통째로 원자적으로 바꾸므로, 나중에 쓴 쪽이 남을 뿐 깨지지는 않습니다.
+MARKET_TICKERS = {'KOSPI': '^KS11', 'NASDAQ': '^IXIC', 'USD/KRW': 'KRW=X'}
+MARKET_TICKERS_FILE = "market_tickers.txt"  # "이름=심볼" 한 줄씩, 있으면 기본 목록 대신 사용
+MARKET_CACHE_FILE = "market_cache.json"
+MARKET_TTL = 1800
+MARKET_HISTORY_DIR = "market_history"
+MARKET_BACKFILL_DAYS = 400
+MARKET_SPARK_POINTS = 60
+
+def load_market_tickers():
+    if os.path.exists(MARKET_TICKERS_FILE):
+        with open(MARKET_TICKERS_FILE, "r", encoding="utf-8") as f:
+            pairs = [line.split("=", 1) for line in f if "=" in line]
+        tickers = {name.strip(): symbol.strip() for name, symbol in pairs if name.strip() and symbol.strip()}
+        if tickers: return tickers
+    return MARKET_TICKERS
+
+# 시세 제공자: {심볼: 시작 날짜} -> {심볼: 시작 날짜부터의 일봉 종가 DataFrame(date, close)}.
+# 테스트용으로 MARKET_PROVIDER=stub 을 쓸 수 있습니다.
+def yfinance_closes(starts):
+    import yfinance as yf  # 무거운 모듈이라 처음 조회할 때 불러옵니다.
+    def fetch(symbol):
+        try:
+            with perf_span("외부", f"yfinance {symbol}"):
+                closes = yf.Ticker(symbol).history(start=starts[symbol].strftime("%Y-%m-%d"), timeout=10)['Close'].dropna()
+            return symbol, pd.DataFrame({"date": pd.to_datetime(closes.index.date), "close": closes.to_numpy(dtype="float64")})
+        except: return symbol, None
+    with ThreadPoolExecutor(max_workers=max(1, len(starts))) as pool:
+        return {symbol: bars for symbol, bars in pool.map(fetch, starts) if bars is not None and not bars.empty}
+
+def stub_closes(starts):
+    bars = {}
+    for i, (symbol, start) in enumerate(starts.items()):
+        dates = pd.bdate_range(start, datetime.now().date())
+        bars[symbol] = pd.DataFrame({"date": dates, "close": 100.0 + i + (dates.dayofyear % 7) + (dates.year - 2000) * 0.5})
+    return bars
+
+MARKET_PROVIDERS = {"yfinance": yfinance_closes, "stub": stub_closes}
+
+@st.cache_resource
+def get_market_state():
+    snapshot = {"updated": 0, "data": {}}
+    if os.path.exists(MARKET_CACHE_FILE):
+        try:
+            with open(perf_read(MARKET_CACHE_FILE), "r", encoding="utf-8") as f: snapshot = json.load(f)
+        except: pass
+    return {"lock": threading.Lock(), "refreshing": False, "snapshot": snapshot}
+
+def market_history_path(symbol):
+    return os.path.join(MARKET_HISTORY_DIR, "".join(c if c.isalnum() else "_" for c in symbol) + ".parquet")
+
+def load_market_history(symbol):
+    path = market_history_path(symbol)
+    if os.path.exists(path): return pd.read_parquet(perf_read(path))
+    return pd.DataFrame({"date": pd.Series(dtype="datetime64[ms]"), "close": pd.Series(dtype="float64")})
+
+def save_market_history(symbol, hist):
+    os.makedirs(MARKET_HISTORY_DIR, exist_ok=True)
+    path, tmp = market_history_path(symbol), temp_path(market_history_path(symbol))
+    hist.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    perf_wrote(path)
+
+def market_summary(hist):
+    dates, closes = hist['date'], hist['close'].to_numpy()
+    current = closes[-1]
+    prev = closes[-2] if len(closes) > 1 else current
+    def change_since(days):
+        i = dates.searchsorted(dates.iloc[-1] - pd.Timedelta(days=days), side="right") - 1
+        return None if i < 0 else float((current / closes[i] - 1) * 100)
+    return {"price": float(current), "change": float(current - prev), "pct": float((current - prev) / prev * 100),
+            "m1": change_since(30), "y1": change_since(365), "spark": closes[-MARKET_SPARK_POINTS:].round(4).tolist()}
+
+@perf_timed
+def refresh_finance_data():
+    state = get_market_state()
     try:
-        tickers = {'KOSPI': '^KS11', 'NASDAQ': '^IXIC', 'USD/KRW': 'KRW=X'}
+        tickers = load_market_tickers()
+        provider = MARKET_PROVIDERS[os.environ.get("MARKET_PROVIDER", "yfinance")]
+        histories = {symbol: load_market_history(symbol) for symbol in set(tickers.values())}
+        backfill = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=MARKET_BACKFILL_DAYS)
+        starts = {symbol: hist['date'].iloc[-1] if len(hist) else backfill for symbol, hist in histories.items()}
+        for symbol, bars in provider(starts).items():
+            merged = pd.concat([histories[symbol], bars.astype(histories[symbol].dtypes)], ignore_index=True)
+            histories[symbol] = merged.drop_duplicates("date", keep="last").sort_values("date", ignore_index=True)
+            save_market_history(symbol, histories[symbol])
         data = {}
         for name, symbol in tickers.items():
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="2d", timeout=10)
-                if len(hist) >= 1:
-                    current = hist['Close'].iloc[-1]
-                    prev = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                    change = current - prev
-                    change_pct = (change / prev) * 100
-                    data[name] = {"price": current, "change": change, "pct": change_pct}
-            except: continue
-        return data
-    except: return {}
+            hist = histories[symbol]
+            if len(hist): data[name] = market_summary(hist)
+            elif name in state["snapshot"]["data"]:
+                data[name] = state["snapshot"]["data"][name]  # 실패한 티커는 마지막 정상값 유지
+        snapshot = {"updated": time.time(), "data": data}
+        write_json_atomic(MARKET_CACHE_FILE, snapshot)
+        state["snapshot"] = snapshot
+    finally:
+        with state["lock"]: state["refreshing"] = False
+
+def sparkline_svg(values, color):
+    if not values or len(values) < 2: return ""
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1
+    points = " ".join(f"{i * 100 / (len(values) - 1):.1f},{24 - (v - lo) * 22 / span:.1f}" for i, v in enumerate(values))
+    return f"<svg class='finance-spark' viewBox='0 0 100 26' preserveAspectRatio='none'><polyline points='{points}' fill='none' stroke='{color}' stroke-width='1.5' vector-effect='non-scaling-stroke'/></svg>"
+
+@perf_timed
+def get_finance_data():
+    state = get_market_state()
+    with state["lock"]:
+        snapshot = state["snapshot"]
+        if time.time() - snapshot["updated"] > MARKET_TTL and not state["refreshing"]:
+            state["refreshing"] = True
+            threading.Thread(target=refresh_finance_data, daemon=True).start()
+    tickers = load_market_tickers()
+    return {name: snapshot["data"][name] for name in tickers if name in snapshot["data"]}
+
+# 뉴스 - 백그라운드 스케줄러가 09/12/18/21시에 키워드별 RSS 를 동시에 받아 스냅샷 파일(news_snapshot.json)에 저장합니다.
+# 키워드마다 ETag/If-Modified-Since 를 따로 보내서 바뀐 게 없는 피드는 본문을 다시 받지 않고, 화면은 스냅샷만 읽습니다.
+# 한 주제가 목록을 다 차지하지 않도록 키워드별 최신순 목록을 발행 시각순으로 k-way 병합(heapq.merge)하면서 키워드마다 NEWS_PER_KEYWORD 건까지만 싣습니다.
+# 프로세스가 여러 개(DOHA_STORAGE=sqlite)면 스케줄러도 프로세스마다 하나씩 돕니다. 중복 비용은 슬롯마다 피드 요청 몇 번(대개 304)이고,
+# 스냅샷/지문 파일은 통째로 원자적으로 바꾸므로 나중에 쓴 프로세스 것이 남습니다. 각 프로세스 화면은 자기 스냅샷을 보여줍니다.
+NEWS_KEYWORDS = ["소상공인", "자영업", "지원금", "정책", "세금", "창업", "폐업"]
+NEWS_URL = os.environ.get("NEWS_FEED_URL", "https://news.google.com/rss/search?q={query}&hl=ko&gl=KR&ceid=KR:ko")  # {query} 자리에 키워드
+NEWS_SNAPSHOT_FILE = "news_snapshot.json"
+NEWS_DEDUP_FILE = "news_fingerprints.json"
+NEWS_REFRESH_HOURS = [9, 12, 18, 21]
+NEWS_RETRY_SECONDS = 600
+NEWS_FEED_ITEMS = 20  # 키워드별 피드에서 남겨 두는 건수 (중복을 빼고도 NEWS_PER_KEYWORD 를 채울 만큼)
+NEWS_PER_KEYWORD = 5
+NEWS_DEDUP_DAYS = 7
+NEWS_DUP_SIMILARITY = 0.85  # '인하'/'인상'처럼 한 글자만 다른 제목(0.8 안팎)은 다른 기사로 둡니다.
+
+def news_slots(now):
+    today = now.replace(minute=0, second=0, microsecond=0)
+    slots = [today.replace(hour=h) + timedelta(days=d) for d in (-1, 0, 1) for h in NEWS_REFRESH_HOURS]
+    return max(t for t in slots if t <= now), min(t for t in slots if t > now)
+
+def news_feed_url(keyword):
+    return NEWS_URL.replace("{query}", quote(keyword))
+
+# 피드 하나를 최신순으로 돌려줍니다. 바뀐 게 없으면(304) None.
+def fetch_news(url, etag=None, modified=None):
+    import feedparser  # 스케줄러 스레드에서 처음 쓸 때 불러옵니다.
+    with perf_span("외부", "RSS"): feed = feedparser.parse(url, etag=etag, modified=modified)
+    if getattr(feed, "status", None) == 304: return None
+    if feed.bozo and feed.bozo_exception and not feed.entries: raise feed.bozo_exception
+    items = [{"title": e.title, "link": e.link, "published": time.strftime("%Y-%m-%d %H:%M", e.published_parsed)}
+             for e in feed.entries if e.get("published_parsed")]
+    items.sort(key=lambda item: item["published"], reverse=True)
+    return {"items": items[:NEWS_FEED_ITEMS], "etag": feed.get("etag"), "modified": feed.get("modified")}
+
+# 키워드별 피드를 동시에 받습니다. 안 바뀌었거나(304) 실패한 키워드는 지난번 내용을 그대로 쓰고, 전부 실패하면 예외를 냅니다.
+def fetch_keyword_feeds(feeds):
+    def fetch(keyword):
+        old = feeds.get(keyword, {})
+        try: return keyword, fetch_news(news_feed_url(keyword), old.get("etag"), old.get("modified")) or old, True
+        except Exception: return keyword, old, False
+    with ThreadPoolExecutor(max_workers=len(NEWS_KEYWORDS)) as pool:
+        results = list(pool.map(fetch, NEWS_KEYWORDS))
+    if not any(ok for _, _, ok in results): raise RuntimeError("뉴스 피드를 하나도 받지 못했습니다.")
+    return {keyword: feed for keyword, feed, _ in results if feed}
+
+# 중복 기사 색인 - 언론사 꼬리표(" - 언론사")와 말머리([속보], (종합))를 뗀 제목의 2글자 조각 집합을 지문으로 삼아,
+# 겹치는 비율(자카드)이 NEWS_DUP_SIMILARITY 이상이고 제목 속 숫자가 같은 기사를 같은 기사로 봅니다. 후보는 조각→기사 역색인으로 좁힙니다.
+# 처음 본 기사(제목, 링크)가 대표이고, NEWS_DEDUP_DAYS 일 동안 다시 보이지 않은 지문은 파일에서 뺍니다.
+def news_title_key(title):
+    title = re.sub(r"\s+-\s+[^-]+$", "", str(title))
+    title = re.sub(r"\[[^\]]*\]|\([^)]*\)|【[^】]*】", "", title)
+    return "".join(c for c in title.lower() if c.isalnum())
+
+def news_grams(key):
+    return text_ngrams(key) or {key}
+
+def news_dedup_index(entries):
+    dedup = {"entries": [], "sizes": [], "links": {}, "postings": {}}
+    for entry in entries: news_dedup_add(dedup, entry)
+    return dedup
+
+def news_dedup_add(dedup, entry):
+    i = len(dedup["entries"])
+    grams = news_grams(entry["key"])
+    dedup["entries"].append(entry)
+    dedup["sizes"].append(len(grams))
+    dedup["links"][entry["link"]] = i
+    for g in grams: dedup["postings"].setdefault(g, []).append(i)
+    return i
+
+def load_news_dedup():
+    entries = []
+    if os.path.exists(NEWS_DEDUP_FILE):
+        try:
+            with open(perf_read(NEWS_DEDUP_FILE), "r", encoding="utf-8") as f: entries = json.load(f)
+        except: pass
+    return news_dedup_index(entries)
 
-@st.cache_data(ttl=3600)
+# 같은 기사로 보이는 지문의 번호를 돌려주고, 없으면 새 지문으로 등록합니다. 같은 기사의 다른 링크도 번호로 바로 찾게 기억합니다.
+def news_dedup_match(dedup, item, now):
+    i = dedup["links"].get(item["link"])
+    if i is None:
+        key = news_title_key(item["title"])
+        grams = news_grams(key)
+        numbers = re.findall(r"\d+", key)
+        shared = Counter(j for g in grams for j in dedup["postings"].get(g, ()))
+        similar = [j for j, n in shared.items() if n / (len(grams) + dedup["sizes"][j] - n) >= NEWS_DUP_SIMILARITY
+                   and re.findall(r"\d+", dedup["entries"][j]["key"]) == numbers]
+        if not similar: return news_dedup_add(dedup, {"key": key, "title": item["title"], "link": item["link"], "published": item["published"], "seen": now})
+        i = dedup["links"][item["link"]] = max(similar, key=lambda j: shared[j] / (len(grams) + dedup["sizes"][j] - shared[j]))
+    dedup["entries"][i]["seen"] = now
+    return i
+
+def save_news_dedup(dedup):
+    cutoff = (datetime.now() - timedelta(days=NEWS_DEDUP_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    entries = [e for e in dedup["entries"] if e["seen"] >= cutoff]
+    write_json_atomic(NEWS_DEDUP_FILE, entries)
+    return news_dedup_index(entries)
+
+# 키워드별 최신순 목록을 발행 시각순으로 합치면서, 같은 기사는 대표 기사 하나로 모으고 키워드 꼬리표만 더합니다.
+# 지문은 먼저 오래된 것부터 매겨서, 처음 나온 원래 기사가 전재 기사보다 먼저 대표가 되게 합니다.
+# 실리는 제목/링크/발행 시각은 대표 기사 것이라, 나중 전재본 덕에 실린 기사는 목록을 대표 발행 시각순으로 다시 정렬합니다.
+def merge_news(feeds, dedup, now):
+    streams = [[(item["published"], keyword, item) for item in feed.get("items", [])] for keyword, feed in feeds.items()]
+    for _, _, item in heapq.merge(*[s[::-1] for s in streams], key=lambda x: x[0]):
+        news_dedup_match(dedup, item, now)
+    merged, by_entry, taken = [], {}, Counter()
+    for published, keyword, item in heapq.merge(*streams, key=lambda x: x[0], reverse=True):
+        i = dedup["links"][item["link"]]
+        if i in by_entry:
+            if keyword not in by_entry[i]["keywords"]: by_entry[i]["keywords"].append(keyword)
+            continue
+        if taken[keyword] >= NEWS_PER_KEYWORD: continue
+        taken[keyword] += 1
+        entry = dedup["entries"][i]
+        by_entry[i] = {"title": entry["title"], "link": entry["link"], "published": entry.get("published", published), "keywords": [keyword]}
+        merged.append(by_entry[i])
+    merged.sort(key=lambda item: item["published"], reverse=True)
+    return merged
+
+@perf_timed
+def refresh_news():
+    state = get_news_state()
+    feeds = fetch_keyword_feeds(state["snapshot"].get("feeds", {}))
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    items = merge_news(feeds, state["dedup"], now)
+    state["dedup"] = save_news_dedup(state["dedup"])
+    snapshot = {"items": items, "feeds": feeds, "checked": now}
+    write_json_atomic(NEWS_SNAPSHOT_FILE, snapshot)
+    state["snapshot"] = snapshot
+
+def news_scheduler():
+    state = get_news_state()
+    while True:
+        last_slot, next_slot = news_slots(datetime.now())
+        wait = (next_slot - datetime.now()).total_seconds()
+        if state["snapshot"].get("checked", "") < last_slot.strftime("%Y-%m-%d %H:%M:%S"):
+            try: refresh_news()
+            except: wait = min(wait, NEWS_RETRY_SECONDS)
+            else: continue
+        time.sleep(max(1, wait))
+
+@st.cache_resource
+def get_news_state():
+    snapshot = {}
+    if os.path.exists(NEWS_SNAPSHOT_FILE):
+        try:
+            with open(perf_read(NEWS_SNAPSHOT_FILE), "r", encoding="utf-8") as f: snapshot = json.load(f)
+        except: pass
+    return {"snapshot": snapshot, "dedup": load_news_dedup()}
+
+@st.cache_resource
+def start_news_scheduler():
+    thread = threading.Thread(target=news_scheduler, daemon=True)
+    thread.start()
+    return thread
+
+@perf_timed
 def get_real_google_news():
-    keywords = ["소상공인", "자영업", "지원금", "정책", "세금", "창업", "폐업"]
-    query = "+OR+".join(keywords)
-    url = f"https://news.google.com/rss/search?q={query}&hl=ko&gl=KR&ceid=KR:ko"
-    try:
-        feed = feedparser.parse(url)
-        if feed.bozo and feed.bozo_exception: return []
-        return feed.entries[:10]
-    except: return []
+    start_news_scheduler()
+    snapshot = get_news_state()["snapshot"]
+    return snapshot.get("items", []), snapshot.get("checked")
 
 def get_today_affirmation():
     words = ["사장님, 오늘도 대박 나세요!", "오늘 흘린 땀방울이 내일의 매출이 됩니다.", "위기는 기회입니다. 화이팅!", "당신은 최고의 CEO입니다."]
     random.seed(datetime.now().day)
     return random.choice(words)
 
-# 방문자 로그
+# 방문자 로그 - 접속 기록은 추가 전용 로그에, 누적/일별/시간대별 집계는 통계 파일에 증분 반영
 VISITOR_FILE = "visitor_log.csv"
+VISITOR_STATS_FILE = "visitor_stats.json"
+VISITOR_RECENT = 10
+
+@st.cache_resource
+def get_visitor_lock():
+    return threading.Lock()
+
+def load_visitor_stats():
+    return cached_load("visitor_stats", VISITOR_STATS_FILE, _db_read_visitor_stats if STORAGE_BACKEND == "sqlite" else _read_visitor_stats)
+
+def _db_read_visitor_stats():
+    rollup = db_query("SELECT kind, key, count FROM visitor_rollup")
+    groups = {kind: dict(zip(g['key'], g['count'].astype(int).tolist())) for kind, g in rollup.groupby('kind')}
+    recent = db_query("SELECT timestamp, date FROM visitors ORDER BY seq DESC LIMIT ?", (VISITOR_RECENT,))
+    return {"total": groups.get("total", {}).get("", 0), "daily": groups.get("daily", {}), "hourly": groups.get("hourly", {}), "recent": recent.to_dict("records")}
+
+def _read_visitor_stats():
+    if os.path.exists(VISITOR_STATS_FILE):
+        with open(perf_read(VISITOR_STATS_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    # 통계 파일이 없을 때만 기존 로그를 한 번 훑어서 만듭니다.
+    stats = {"total": 0, "daily": {}, "hourly": {}, "recent": []}
+    if os.path.exists(VISITOR_FILE):
+        df = pd.read_csv(perf_read(VISITOR_FILE))
+        ts = pd.to_datetime(df["timestamp"], errors="coerce").dropna()
+        stats["total"] = len(df)
+        stats["daily"] = {k: int(v) for k, v in ts.dt.strftime("%Y-%m-%d").value_counts().sort_index().items()}
+        stats["hourly"] = {k: int(v) for k, v in ts.dt.strftime("%H").value_counts().sort_index().items()}
+        stats["recent"] = df.sort_values("timestamp", ascending=False).head(VISITOR_RECENT).to_dict("records")
+    return stats
+
+@perf_timed
 def track_visitor():
-    if not os.path.exists(VISITOR_FILE):
-        df = pd.DataFrame(columns=["timestamp", "date"])
-        df.to_csv(VISITOR_FILE, index=False)
     if 'visitor_counted' not in st.session_state:
         st.session_state.visitor_counted = True
         now = datetime.now()
         new_row = {"timestamp": now.strftime("%Y-%m-%d %H:%M:%S"), "date": now.strftime("%Y-%m-%d")}
+        hour = now.strftime("%H")
         try:
-            df = pd.read_csv(VISITOR_FILE)
-            df = pd.concat([pd.DataFrame([new_row]), df], ignore_index=True)
-            df.to_csv(VISITOR_FILE, index=False)
+            if STORAGE_BACKEND == "sqlite":
+                db_write([("INSERT INTO visitors (timestamp, date) VALUES (?, ?)", (new_row["timestamp"], new_row["date"])),
+                          (VISITOR_ROLLUP_UPSERT, ("total", "")), (VISITOR_ROLLUP_UPSERT, ("daily", new_row["date"])),
+                          (VISITOR_ROLLUP_UPSERT, ("hourly", hour))], "visitor_stats")
+                bump_file_version("visitor_stats")
+                return
+            with get_visitor_lock():
+                stats = _read_visitor_stats()
+                before = file_size(VISITOR_FILE)
+                pd.DataFrame([new_row]).to_csv(VISITOR_FILE, mode="a", header=not os.path.exists(VISITOR_FILE), index=False)
+                perf_wrote(VISITOR_FILE, before)
+                stats["total"] += 1
+                stats["daily"][new_row["date"]] = stats["daily"].get(new_row["date"], 0) + 1
+                stats["hourly"][hour] = stats["hourly"].get(hour, 0) + 1
+                stats["recent"] = ([new_row] + stats["recent"])[:VISITOR_RECENT]
+                write_json_atomic(VISITOR_STATS_FILE, stats)
+                bump_file_version("visitor_stats")
         except: pass
+@perf_timed
 def get_visitor_count():
-    if os.path.exists(VISITOR_FILE):
-        try:
-            df = pd.read_csv(VISITOR_FILE)
-            return len(df), df, df 
-        except: return 0, pd.DataFrame(), pd.DataFrame()
-    return 0, pd.DataFrame(), pd.DataFrame()
+    try:
+        stats = load_visitor_stats()
+        return stats["total"], pd.DataFrame(stats["recent"]), stats
+    except: return 0, pd.DataFrame(), {}
 
 # 공지사항
 NOTICE_FILE = "notice.txt"
+@perf_timed
 def load_notice():
+    return cached_load("notice", NOTICE_FILE, lambda: _db_read_kv("notice") if STORAGE_BACKEND == "sqlite" else _read_notice())
+def _read_notice():
     if os.path.exists(NOTICE_FILE):
-        with open(NOTICE_FILE, "r", encoding="utf-8") as f:
+        with open(perf_read(NOTICE_FILE), "r", encoding="utf-8") as f:
             return f.read()
-    return "사장님들 힘내세요! 공지사항이 여기에 표시됩니다."
+    return KV_DEFAULTS["notice"]
+@perf_timed
 def save_notice(text):
-    with open(NOTICE_FILE, "w", encoding="utf-8") as f:
-        f.write(text)
+    if STORAGE_BACKEND == "sqlite": _db_write_kv("notice", text)
+    else:
+        with open(NOTICE_FILE, "w", encoding="utf-8") as f:
+            f.write(text)
+        perf_wrote(NOTICE_FILE)
+    bump_file_version("notice")
 
 # 라디오 URL
 RADIO_URL_FILE = "radio_url.txt"
+@perf_timed
 def load_radio_url():
+    return cached_load("radio_url", RADIO_URL_FILE, lambda: _db_read_kv("radio_url").strip() if STORAGE_BACKEND == "sqlite" else _read_radio_url())
+def _read_radio_url():
     if os.path.exists(RADIO_URL_FILE):
-        with open(RADIO_URL_FILE, "r", encoding="utf-8") as f:
+        with open(perf_read(RADIO_URL_FILE), "r", encoding="utf-8") as f:
             return f.read().strip()
-    return "https://www.youtube.com/watch?v=5qap5aO4i9A"
+    return KV_DEFAULTS["radio_url"]
+@perf_timed
 def save_radio_url(url):
-    with open(RADIO_URL_FILE, "w", encoding="utf-8") as f:
-        f.write(url)
+    if STORAGE_BACKEND == "sqlite": _db_write_kv("radio_url", url)
+    else:
+        with open(RADIO_URL_FILE, "w", encoding="utf-8") as f:
+            f.write(url)
+        perf_wrote(RADIO_URL_FILE)
+    bump_file_version("radio_url")
 
-# 장부
+KV_DEFAULTS = {"notice": "사장님들 힘내세요! 공지사항이 여기에 표시됩니다.", "radio_url": "https://www.youtube.com/watch?v=5qap5aO4i9A"}
+def _db_read_kv(key):
+    row = db_conn().execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else KV_DEFAULTS[key]
+def _db_write_kv(key, value):
+    db_write([("INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value))], key)
+
+# 장부 - 가게별, 월별로 나눈 파티션(ledger/<가게>/<YYYY-MM>.parquet)에 타입이 있는 컬럼으로 저장합니다.
+# 새 행은 가게별 추가 전용 저널에 붙이고, 저널이 커지면 백그라운드에서 월 파티션으로 합칩니다.
+# 행마다 가게 안에서의 입력 순서(seq)를 두고, 읽은 표는 seq 를 인덱스로 최신순 정렬합니다.
+LEDGER_DIR = "ledger"
+LEDGER_COLUMNS = ["날짜", "구분", "항목", "금액", "메모"]
+LEDGER_SCHEMA = pa.schema([("seq", pa.int64()), ("날짜", pa.date32()), ("구분", pa.string()),
+                           ("항목", pa.string()), ("금액", pa.int64()), ("메모", pa.string())])
+LEDGER_COMPACT_BYTES = 1_000_000
+# 예전 단일 장부 파일 (migrate_legacy_ledger 로 한 번 옮깁니다)
 LEDGER_FILE = "ledger_data.csv"
-def load_ledger():
-    if os.path.exists(LEDGER_FILE): return pd.read_csv(LEDGER_FILE)
-    return pd.DataFrame(columns=["날짜", "구분", "항목", "금액", "메모"]) 
-def save_ledger(date, type_, item, amount, memo):
-    df = load_ledger()
-    new_row = {"날짜": date, "구분": type_, "항목": item, "금액": amount, "메모": memo}
-    df = pd.concat([pd.DataFrame([new_row]), df], ignore_index=True)
-    df.to_csv(LEDGER_FILE, index=False)
-    return df
+LEDGER_JOURNAL = "ledger_journal.csv"
+LEDGER_SEGMENT_GLOB = "ledger_journal.*.csv"
+
+@st.cache_resource
+def get_ledger_state():
+    return {"lock": threading.Lock(), "compacting": set(), "stores": {}}
+
+def ledger_store_state(state, store):
+    return state["stores"].setdefault(store, {"rows": None, "index": None, "rollup": None, "write": threading.Lock()})
+
+def ledger_dir(store):
+    return os.path.join(LEDGER_DIR, store or "_")
+
+def _ledger_journal(store):
+    return os.path.join(ledger_dir(store), "journal.csv")
+
+def _ledger_segments(store):
+    return sorted(glob.glob(os.path.join(ledger_dir(store), "journal.*.csv")))
+
+# 파티션 가지치기 - 파일 이름의 월이 조회 기간에 걸치는 파티션만 엽니다.
+def ledger_months(date_range):
+    if not date_range: return None
+    return str(date_range[0])[:7], str(date_range[-1])[:7]
+
+def _ledger_partitions(store, months=None):
+    paths = sorted(glob.glob(os.path.join(ledger_dir(store), "*.parquet")))
+    if months: paths = [p for p in paths if months[0] <= os.path.basename(p)[:7] <= months[1]]
+    return paths
+
+# 항목/메모는 "1234", "007" 같은 값도 글자 그대로 둡니다. (숫자로 읽히면 앞의 0 이 사라지고 파티션에 쓸 수 없음)
+LEDGER_TEXT_DTYPES = {"항목": str, "메모": str}
+
+def read_ledger_csv(path):
+    return pd.read_csv(perf_read(path), dtype=LEDGER_TEXT_DTYPES)
+
+def ledger_typed(df):
+    return pd.DataFrame({"seq": df["seq"].astype("int64"), "날짜": pd.to_datetime(df["날짜"]),
+                         "구분": df["구분"], "항목": df["항목"].astype("string"),
+                         "금액": pd.to_numeric(df["금액"]).fillna(0).astype("int64"), "메모": df["메모"].astype("string")})
+
+def ledger_row_count(store):
+    if STORAGE_BACKEND == "sqlite":
+        return db_conn().execute("SELECT COUNT(*) FROM ledger_entries WHERE store = ?", (store,)).fetchone()[0]
+    state = get_ledger_state()
+    with state["lock"]: return _ledger_file_rows(ledger_store_state(state, store), store)
+
+# 합치기가 파티션 교체와 세그먼트 삭제 사이에서 멈췄으면 같은 행이 양쪽에 있으므로, 건수 대신 가장 큰 seq + 1 을 씁니다.
+# 파티션은 파일 메타데이터의 seq 최댓값만 봅니다.
+def _ledger_file_rows(s, store):
+    if s["rows"] is None:
+        last = [-1]
+        for p in _ledger_partitions(store):
+            meta = pq.read_metadata(p)
+            last += [meta.row_group(i).column(0).statistics.max for i in range(meta.num_row_groups) if meta.row_group(i).num_rows]
+        for p in [_ledger_journal(store)] + _ledger_segments(store):
+            if os.path.exists(p): last.append(pd.read_csv(perf_read(p), usecols=["seq"])["seq"].max())
+        s["rows"] = int(max(last)) + 1
+    return s["rows"]
+
+# 쓰기 버전과 저널 파일 stat 으로 캐시를 확인하고, 조회 월 범위별로 따로 캐시합니다.
+@perf_timed
+def load_ledger(store, date_range=None):
+    months = ledger_months(date_range)
+    reader = (lambda: _db_read_ledger(store, months)) if STORAGE_BACKEND == "sqlite" else (lambda: _read_ledger(store, months))
+    return cached_load(f"ledger:{store}", _ledger_journal(store), reader, part=months)
+
+def _db_read_ledger(store, months=None):
+    sql = "SELECT seq, date AS 날짜, type AS 구분, item AS 항목, amount AS 금액, memo AS 메모 FROM ledger_entries WHERE store = ?"
+    params = [store]
+    if months:
+        sql += " AND date >= ? AND date < ?"
+        params += [months[0], months[1] + "-32"]
+    return ledger_typed(db_query(sql + " ORDER BY seq DESC", params)).set_index("seq")
+
+def _read_ledger(store, months=None):
+    with get_ledger_state()["lock"]:
+        journals = [read_ledger_csv(p) for p in [_ledger_journal(store)] + _ledger_segments(store) if os.path.exists(p)]
+        tables = [pq.read_table(perf_read(p)) for p in _ledger_partitions(store, months)]
+    parts = [ledger_typed(j) for j in journals]
+    if months: parts = [p[p['날짜'].dt.strftime("%Y-%m").between(*months)] for p in parts]
+    if tables: parts.append(ledger_typed(pa.concat_tables(tables).to_pandas(date_as_object=False)))
+    df = pd.concat(parts, ignore_index=True) if parts else ledger_typed(pd.DataFrame(columns=["seq"] + LEDGER_COLUMNS))
+    return df.drop_duplicates("seq").sort_values("seq", ascending=False).set_index("seq")
+
+@perf_timed
+def save_ledger(store, date, type_, item, amount, memo):
+    append_ledger_rows(store, pd.DataFrame([{"날짜": date, "구분": type_, "항목": item, "금액": amount, "메모": memo}]))
+
+# 여러 행을 입력 순서대로 한 번에 붙입니다. (색인/집계가 있으면 같이 갱신)
+@perf_timed
+def append_ledger_rows(store, rows):
+    rows = rows[LEDGER_COLUMNS].assign(날짜=pd.to_datetime(rows['날짜']).dt.strftime("%Y-%m-%d"))
+    state = get_ledger_state()
+    with state["lock"]: s = ledger_store_state(state, store)
+    # SQLite 는 쓰기 스레드가 seq 를 매기므로, 같은 가게 쓰기는 색인/집계 반영까지 하나씩 해서 codes 가 seq 순서대로 쌓이게 합니다.
+    with s["write"] if STORAGE_BACKEND == "sqlite" else contextlib.nullcontext():
+        if STORAGE_BACKEND == "sqlite":
+            insert = """INSERT INTO ledger_entries (store, seq, date, type, item, amount, memo)
+                        VALUES (?, (SELECT COALESCE(MAX(seq), -1) + 1 FROM ledger_entries WHERE store = ?), ?, ?, ?, ?, ?)"""
+            values = rows.astype(object).where(rows.notna(), None).itertuples(index=False)
+            db_write([(insert, (store, store, d, t, i, int(a), m)) for d, t, i, a, m in values], f"ledger:{store}")
+        with state["lock"]:
+            if STORAGE_BACKEND != "sqlite":
+                count = _ledger_file_rows(s, store)
+                os.makedirs(ledger_dir(store), exist_ok=True)
+                journal = _ledger_journal(store)
+                before = file_size(journal)
+                rows.assign(seq=range(count, count + len(rows)))[["seq"] + LEDGER_COLUMNS].to_csv(
+                    journal, mode="a", header=not os.path.exists(journal), index=False)
+                perf_wrote(journal, before)
+                s["rows"] = count + len(rows)
+            for date, type_, item, amount, memo in rows.itertuples(index=False) if s["index"] is not None or s["rollup"] is not None else ():
+                if s["index"] is not None: ngram_index_add(s["index"], item, memo)
+                if s["rollup"] is not None: rollup_add(s["rollup"], date, type_, item, amount)
+            bump_file_version(f"ledger:{store}")
+            if STORAGE_BACKEND == "sqlite" or os.path.getsize(journal) < LEDGER_COMPACT_BYTES: return
+            if not seal_ledger_journal(state, store): return
+    threading.Thread(target=compact_ledger, args=(store,), daemon=True).start()
+
+# 저널 봉인 - 호출하는 쪽이 잠금을 잡고 부르며, 합치기 스레드를 새로 띄워야 하면 True 를 돌려줍니다.
+def seal_ledger_journal(state, store):
+    os.replace(_ledger_journal(store), os.path.join(ledger_dir(store), f"journal.{time.time_ns()}.csv"))
+    if store in state["compacting"]: return False
+    state["compacting"].add(store)
+    return True
+
+# 봉인된 세그먼트를 월 파티션별 임시 파일로 쓴 뒤, 잠금 안에서 파티션 교체와 세그먼트 삭제를 한 번에 합니다.
+# 그 사이에 멈춰서 같은 세그먼트를 다시 합치게 되어도, 파티션에 이미 있는 seq 는 한 번만 남깁니다.
+def write_ledger_partitions(store, rows):
+    rows = ledger_typed(rows)
+    written = []
+    for month, part in rows.groupby(rows['날짜'].dt.strftime("%Y-%m")):
+        path = os.path.join(ledger_dir(store), f"{month}.parquet")
+        if os.path.exists(path):
+            part = pd.concat([pq.read_table(perf_read(path)).to_pandas(date_as_object=False), part], ignore_index=True)
+            part = part.drop_duplicates("seq", keep="last")
+        pq.write_table(pa.Table.from_pandas(part.sort_values("seq"), schema=LEDGER_SCHEMA, preserve_index=False), path + ".tmp")
+        perf_io(path, written=file_size(path + ".tmp"))
+        written.append(path)
+    return written
+
+@perf_timed
+def compact_ledger(store):
+    state = get_ledger_state()
+    try:
+        while segments := _ledger_segments(store):
+            written = write_ledger_partitions(store, pd.concat([read_ledger_csv(p) for p in segments], ignore_index=True))
+            with state["lock"]:
+                for path in written: os.replace(path + ".tmp", path)
+                for p in segments: os.remove(p)
+    finally:
+        with state["lock"]: state["compacting"].discard(store)
+
+# 예전 단일 장부(CSV 파일들, SQLite 의 ledger 테이블)를 한 가게의 파티션으로 한 번 옮깁니다.
+# 옮긴 파일/테이블은 지우지 않고 .migrated 로 이름만 바꿉니다. (python migrate_ledger.py <가게이름>)
+def migrate_legacy_ledger(store):
+    paths = [LEDGER_JOURNAL] + sorted(glob.glob(LEDGER_SEGMENT_GLOB))[::-1]
+    parts = [read_ledger_csv(p).iloc[::-1] for p in paths if os.path.exists(p)]
+    if os.path.exists(LEDGER_FILE): parts.append(read_ledger_csv(LEDGER_FILE))
+    legacy_table = STORAGE_BACKEND == "sqlite" and db_conn().execute("SELECT 1 FROM sqlite_master WHERE name = 'ledger'").fetchone() is not None
+    if legacy_table:
+        parts.insert(0, db_query("SELECT date AS 날짜, type AS 구분, item AS 항목, amount AS 금액, memo AS 메모 FROM ledger ORDER BY seq DESC"))
+    if not parts: return 0
+    legacy = pd.concat(parts, ignore_index=True).iloc[::-1]
+    append_ledger_rows(store, legacy)
+    if legacy_table: db_write([("ALTER TABLE ledger RENAME TO ledger_migrated", ())])
+    if STORAGE_BACKEND != "sqlite":
+        state = get_ledger_state()
+        with state["lock"]: start = os.path.exists(_ledger_journal(store)) and seal_ledger_journal(state, store)
+        if start: compact_ledger(store)
+        while store in state["compacting"]: time.sleep(0.1)
+    for p in paths + [LEDGER_FILE]:
+        if os.path.exists(p): os.replace(p, p + ".migrated")
+    return len(legacy)
+
+# 장부 일괄 불러오기 - 카드 단말기/은행 내역 CSV·XLSX 를 조각(chunk) 단위로 읽어 장부 열로 바꾸고,
+# 이미 있는 행과 같은 행은 해시 키로 걸러낸 뒤 조각마다 append_ledger_rows 로 한 번에 붙입니다.
+# 같은 날 같은 금액의 거래가 여러 번 있을 수 있으므로 키는 (행 내용, 같은 내용의 몇 번째인지)입니다.
+IMPORT_CHUNK_ROWS = 50_000
+IMPORT_COLUMN_HINTS = {"날짜": ["거래일", "승인일", "일자", "날짜", "일시"], "항목": ["가맹점", "적요", "거래처", "항목", "내용"],
+                       "메모": ["메모", "비고", "승인번호"], "금액": ["승인금액", "거래금액", "금액"], "입금": ["입금"], "출금": ["출금"]}
+IMPORT_TYPE_RULES = ["부호로 (양수=매출, 음수=지출)", "전부 매출 (수입)", "전부 지출 (비용)", "입금/출금 두 열"]
+
+def import_encoding(file):
+    file.seek(0)
+    head = file.read(65536)
+    file.seek(0)
+    try: head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 4: return "cp949"
+    return "utf-8-sig"
+
+def iter_import_chunks(file, name, skip_rows=0, nrows=None):
+    file.seek(0)
+    if name.lower().endswith(".xlsx"):
+        import openpyxl
+        rows = openpyxl.load_workbook(file, read_only=True, data_only=True).active.iter_rows(values_only=True)
+        for _ in range(skip_rows): next(rows, None)
+        header = [str(c) for c in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == (nrows or IMPORT_CHUNK_ROWS):
+                yield pd.DataFrame(chunk, columns=header, dtype=object).astype("string")
+                if nrows: return
+                chunk = []
+        if chunk: yield pd.DataFrame(chunk, columns=header, dtype=object).astype("string")
+    else:
+        yield from pd.read_csv(file, encoding=import_encoding(file), skiprows=skip_rows, dtype=str, nrows=nrows,
+                               chunksize=nrows or IMPORT_CHUNK_ROWS, skipinitialspace=True)
+
+def guess_import_mapping(columns):
+    mapping = {}
+    for field, hints in IMPORT_COLUMN_HINTS.items():
+        mapping[field] = next((c for h in hints for c in columns if h in str(c)), None)
+    mapping["구분"] = IMPORT_TYPE_RULES[3] if mapping["입금"] and mapping["출금"] else IMPORT_TYPE_RULES[0]
+    return mapping
+
+def import_amount(col):
+    return pd.to_numeric(col.str.replace(",", "", regex=False).str.strip(), errors="coerce").fillna(0)
+
+# 내역 한 조각을 장부 열로 바꿉니다. 날짜를 못 읽거나 금액이 0 인 줄은 버립니다.
+def import_rows(chunk, mapping):
+    def text(field): return chunk[mapping[field]].fillna("").str.strip() if mapping.get(field) else pd.Series("", index=chunk.index)
+    dates = chunk[mapping["날짜"]].str.strip().str[:10].str.replace(".", "-", regex=False).str.replace("/", "-", regex=False)
+    dates = pd.to_datetime(dates, format="%Y-%m-%d", errors="coerce")
+    rule = mapping["구분"]
+    if rule == IMPORT_TYPE_RULES[3]:
+        income, expense = import_amount(chunk[mapping["입금"]]), import_amount(chunk[mapping["출금"]])
+        amount = income.where(income != 0, -expense)
+    else: amount = import_amount(chunk[mapping["금액"]])
+    if rule == IMPORT_TYPE_RULES[1]: types = pd.Series("매출 (수입)", index=chunk.index)
+    elif rule == IMPORT_TYPE_RULES[2]: types = pd.Series("지출 (비용)", index=chunk.index)
+    else: types = pd.Series(np.where(amount > 0, "매출 (수입)", "지출 (비용)"), index=chunk.index)
+    rows = pd.DataFrame({"날짜": dates, "구분": types, "항목": text("항목"), "금액": amount.abs().round().astype("int64"), "메모": text("메모")})
+    return rows[rows['날짜'].notna() & (rows['금액'] != 0)].reset_index(drop=True)
+
+def ledger_row_hashes(df):
+    return pd.util.hash_pandas_object(pd.DataFrame({
+        "날짜": pd.to_datetime(df['날짜']).to_numpy().astype("datetime64[D]").astype("int64"), "구분": df['구분'].astype(str),
+        "항목": df['항목'].fillna("").astype(str).str.strip(), "금액": df['금액'].astype("int64"),
+        "메모": df['메모'].fillna("").astype(str).str.strip()}), index=False).to_numpy()
+
+# seen 은 앞 조각들에서 본 내용별 건수이고, 이번 조각까지 더한 값을 같이 돌려줍니다.
+def occurrence_keys(hashes, seen=None):
+    h = pd.Series(hashes)
+    occ = h.groupby(h).cumcount().to_numpy()
+    if seen is not None: occ = occ + h.map(seen).fillna(0).astype("int64").to_numpy()
+    counts = h.value_counts()
+    seen = counts if seen is None else seen.add(counts, fill_value=0).astype("int64")
+    return pd.util.hash_pandas_object(pd.DataFrame({"h": hashes, "k": occ}), index=False).to_numpy(), seen
+
+@perf_timed
+def import_ledger_file(store, file, name, mapping, skip_rows=0, progress=None):
+    existing = np.sort(occurrence_keys(ledger_row_hashes(load_ledger(store)))[0])
+    seen, added, skipped, read = None, 0, 0, 0
+    for chunk in iter_import_chunks(file, name, skip_rows):
+        rows = import_rows(chunk, mapping)
+        keys, seen = occurrence_keys(ledger_row_hashes(rows), seen)
+        pos = np.minimum(np.searchsorted(existing, keys), max(len(existing) - 1, 0))
+        new = rows[existing[pos] != keys] if len(existing) else rows
+        if len(new): append_ledger_rows(store, new)
+        read += len(chunk)
+        added += len(new)
+        skipped += len(chunk) - len(new)
+        if progress: progress(read, added)
+    return added, skipped
+
+# 장부 검색 - 항목/메모의 2글자 조각(2-gram) 역색인으로 후보를 좁힌 뒤, 후보만 확인합니다.
+# 한글은 띄어쓰기가 제각각이라 단어 단위보다 글자 조각 단위가 잘 맞습니다.
+# 장부는 같은 (항목, 메모) 조합이 반복되므로 색인은 서로 다른 조합(text id) 단위로 만들고,
+# 행마다 text id 만 codes 에 입력 순서(seq)대로 쌓으므로, 기간으로 잘라 읽은 표도 seq 로 바로 찾습니다.
+def text_ngrams(text, n=2):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def ngram_index_add(index, item, memo):
+    key = ("" if pd.isna(item) else str(item).lower(), "" if pd.isna(memo) else str(memo).lower())
+    text_id = index["ids"].get(key)
+    if text_id is None:
+        text_id = index["ids"][key] = len(index["texts"])
+        index["texts"].append(key)
+        for g in text_ngrams(key[0]) | text_ngrams(key[1]):
+            index["postings"].setdefault(g, array("i")).append(text_id)
+    index["codes"].append(text_id)
+
+def build_ngram_index(df):
+    index = {"ids": {}, "texts": [], "postings": {}, "codes": array("i")}
+    items = df['항목'].iloc[::-1].fillna("").astype(str).str.lower()
+    memos = df['메모'].iloc[::-1].fillna("").astype(str).str.lower()
+    codes, uniques = pd.factorize(items + "\x1f" + memos)
+    for key in uniques:
+        item, memo = key.split("\x1f", 1)
+        ngram_index_add(index, item, memo)
+    index["codes"] = array("i", codes.astype(np.int32).tobytes())
+    return index
+
+# 색인은 가게 전체 행 기준이라, 행 수가 달라졌을 때만 가게 전체를 읽어 다시 만듭니다.
+@perf_timed
+def get_ledger_index(store):
+    state = get_ledger_state()
+    rows = ledger_row_count(store)
+    with state["lock"]: index = ledger_store_state(state, store)["index"]
+    if index is not None and len(index["codes"]) == rows: return index
+    index = build_ngram_index(load_ledger(store))
+    with state["lock"]: ledger_store_state(state, store)["index"] = index
+    return index
+
+@perf_timed
+def search_ledger(store, df, text="", date_range=None, types=None):
+    mask = np.ones(len(df), dtype=bool)
+    text = text.strip().lower()
+    if text:
+        index = get_ledger_index(store)
+        grams = text_ngrams(text)
+        if grams:
+            postings = sorted((index["postings"].get(g, array("i")) for g in grams), key=len)
+            text_ids = np.frombuffer(postings[0], dtype=np.int32)
+            for p in postings[1:]:
+                text_ids = np.intersect1d(text_ids, np.frombuffer(p, dtype=np.int32), assume_unique=True)
+        else: text_ids = range(len(index["texts"]))
+        texts = index["texts"]
+        hits = [i for i in text_ids if text in texts[i][0] or text in texts[i][1]]
+        mask = np.isin(np.frombuffer(index["codes"], dtype=np.int32)[df.index.to_numpy()], hits)
+    return df[mask & ledger_filter_mask(df, date_range, types)]
+
+def ledger_filter_mask(df, date_range=None, types=None):
+    mask = np.ones(len(df), dtype=bool)
+    if date_range:
+        dates = df['날짜']
+        mask &= ((dates >= pd.Timestamp(date_range[0])) & (dates <= pd.Timestamp(date_range[-1]))).to_numpy()
+    if types:
+        mask &= df['구분'].isin(types).to_numpy()
+    return mask
+
+# 장부 집계 - (날짜, 구분, 항목)별 합계/건수를 미리 만들어 두고 save_ledger 가 한 행씩 더합니다.
+# 요약 카드와 추이 차트는 원본 행 대신 이 집계(날짜×항목 수만큼)만 읽습니다.
+def build_ledger_rollup(df):
+    g = df.groupby(['날짜', '구분', '항목'], dropna=False)['금액'].agg(['sum', 'count'])
+    totals = {k: [s, c] for k, s, c in zip(g.index, g['sum'], g['count'])}
+    return {"rows": len(df), "totals": totals, "frame": None}
+
+def rollup_add(rollup, date, type_, item, amount):
+    total = rollup["totals"].setdefault((pd.Timestamp(date), type_, item), [0, 0])
+    total[0] += amount
+    total[1] += 1
+    rollup["rows"] += 1
+    rollup["frame"] = None
+
+@perf_timed
+def get_ledger_rollup(store):
+    state = get_ledger_state()
+    rows = ledger_row_count(store)
+    with state["lock"]: rollup = ledger_store_state(state, store)["rollup"]
+    if rollup is None or rollup["rows"] != rows:
+        rollup = build_ledger_rollup(load_ledger(store))
+        with state["lock"]: ledger_store_state(state, store)["rollup"] = rollup
+    with state["lock"]:
+        if rollup["frame"] is None:
+            frame = pd.DataFrame([(*k, s, c) for k, (s, c) in rollup["totals"].items()], columns=["날짜", "구분", "항목", "금액", "건수"])
+            rollup["frame"] = frame.assign(날짜=pd.to_datetime(frame['날짜']))
+        return rollup["frame"]
+
+def ledger_totals(rollup, date_range=None, types=None):
+    r = rollup[ledger_filter_mask(rollup, date_range, types)]
+    income = r.loc[r['구분'] == "매출 (수입)", '금액'].sum()
+    expense = r.loc[r['구분'] == "지출 (비용)", '금액'].sum()
+    return income, expense
+
+def ledger_monthly(rollup, date_range=None):
+    r = rollup[ledger_filter_mask(rollup, date_range)]
+    monthly = r.assign(월=r['날짜'].dt.strftime("%Y-%m")).pivot_table(index='월', columns='구분', values='금액', aggfunc='sum', fill_value=0)
+    monthly = monthly.reindex(columns=["매출 (수입)", "지출 (비용)"], fill_value=0)
+    monthly['순이익'] = monthly["매출 (수입)"] - monthly["지출 (비용)"]
+    return monthly
+
+def ledger_by_item(rollup, date_range=None):
+    r = rollup[ledger_filter_mask(rollup, date_range)]
+    return r.groupby(['구분', '항목'])[['금액', '건수']].sum().sort_values('금액', ascending=False).reset_index()
+
+def ledger_period(name):
+    today = datetime.now().date()
+    if name == "이번 달": return (today.replace(day=1), today)
+    if name == "지난 12개월":
+        start = (pd.Timestamp(today.replace(day=1)) - pd.DateOffset(months=11)).date()
+        return (start, today)
+    return None
+
+# 장부 내보내기 - 다운로드 버튼을 누를 때만 파일을 만들고, (가게, 조회 조건, 장부 버전, 형식)별로
+# 최근 몇 개를 메모리에 둬서 같은 내보내기를 다시 받을 때는 만들지 않습니다.
+EXPORT_CACHE_SIZE = 8
+EXPORT_CHUNK_ROWS = 50_000
+EXPORT_FORMATS = {"CSV": ("csv", "text/csv"), "엑셀(xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")}
+XLSX_MAX_ROWS = 1_048_575
+
+@st.cache_resource
+def get_export_cache():
+    return {"lock": threading.Lock(), "entries": {}}
+
+def ledger_version(store):
+    return cache_signature(f"ledger:{store}", _ledger_journal(store))
+
+@perf_timed
+def ledger_export(key, fmt, df):
+    cache = get_export_cache()
+    with cache["lock"]:
+        data = cache["entries"].pop((key, fmt), None)
+        if data is not None:
+            cache["entries"][(key, fmt)] = data
+            return data
+    data = export_csv(df) if EXPORT_FORMATS[fmt][0] == "csv" else export_xlsx(df)
+    with cache["lock"]:
+        cache["entries"][(key, fmt)] = data
+        while len(cache["entries"]) > EXPORT_CACHE_SIZE: cache["entries"].pop(next(iter(cache["entries"])))
+    return data
+
+# 엑셀에서 한글이 깨지지 않도록 BOM 을 붙이고, 행을 조각 단위로 이어 씁니다.
+def export_csv(df):
+    out = io.BytesIO()
+    out.write("\ufeff".encode("utf-8"))
+    for start in range(0, max(len(df), 1), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        out.write(chunk.to_csv(index=False, header=start == 0, date_format="%Y-%m-%d").encode("utf-8"))
+    return out.getvalue()
+
+def export_xlsx(df):
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("장부")
+    ws.append(list(df.columns))
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        chunk = chunk.assign(날짜=chunk['날짜'].dt.date).astype(object)
+        for row in chunk.where(chunk.notna(), None).itertuples(index=False): ws.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+# 손익분기 시나리오 - 월 고정비 × 영업 일수 × 마진율 격자 전체를 NumPy 브로드캐스트 한 번으로 계산합니다.
+# 같은 입력이면 세션이 달라도 만들어 둔 배열(읽기 전용)을 그대로 돌려주므로 슬라이더를 움직여도 다시 계산하지 않습니다.
+FIXED_COST_HINTS = ["월세", "임대", "관리비", "인건비", "급여", "전기", "가스", "수도", "통신", "보험"]
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def breakeven_grid(fixed_range, fixed_steps, days_range, margin_range):
+    fixed = np.linspace(fixed_range[0], fixed_range[1], fixed_steps)
+    days = np.arange(days_range[0], days_range[1] + 1)
+    margins = np.arange(margin_range[0], margin_range[1] + 1)
+    grid = fixed[:, None, None] / days[None, :, None] / (margins[None, None, :] / 100)
+    grid.flags.writeable = False
+    return fixed, days, margins, grid
+
+def ledger_expense_items(store):
+    if not ledger_row_count(store): return []
+    rollup = get_ledger_rollup(store)
+    return sorted(rollup.loc[rollup['구분'] == "지출 (비용)", '항목'].dropna().unique().tolist())
+
+# 장부에서 고른 항목의 최근 몇 달(이번 달 제외) 지출 평균을 월 고정비로 씁니다.
+@perf_timed
+def ledger_fixed_costs(store, items, months=3):
+    if not items or not ledger_row_count(store): return 0
+    end = pd.Timestamp(datetime.now().date().replace(day=1))
+    start = end - pd.DateOffset(months=months)
+    r = get_ledger_rollup(store)
+    r = r[(r['구분'] == "지출 (비용)") & r['항목'].isin(items) & (r['날짜'] >= start) & (r['날짜'] < end)]
+    return r['금액'].sum() / months
 
 # 출퇴근부
+def store_key(name):
+    return "".join([c for c in name if c.isalnum()])
+def get_store_key():
+    return store_key(st.session_state.store_name)
 def get_csv_filename():
-    safe_name = "".join([c for c in st.session_state.store_name if c.isalnum()])
-    return f"log_{safe_name}.csv"
+    return f"log_{get_store_key()}.csv"
+@perf_timed
 def load_attendance():
-    filename = get_csv_filename()
-    if os.path.exists(filename): return pd.read_csv(filename)
+    store, filename = get_store_key(), get_csv_filename()
+    reader = (lambda: _db_read_attendance(store)) if STORAGE_BACKEND == "sqlite" else (lambda: _read_attendance(filename))
+    return cached_load(f"attendance:{store}", filename, reader)
+def _db_read_attendance(store):
+    return db_query("SELECT time AS 일시, name AS 직원명, action AS 구분 FROM attendance WHERE store = ? ORDER BY seq DESC", (store,))
+def _read_attendance(filename):
+    if os.path.exists(filename): return pd.read_csv(perf_read(filename))
     return pd.DataFrame(columns=["일시", "직원명", "구분"])
+@perf_timed
 def save_attendance(name, action):
-    df = load_attendance()
     new_row = {"일시": datetime.now().strftime("%Y-%m-%d %H:%M"), "직원명": name, "구분": action}
+    if STORAGE_BACKEND == "sqlite":
+        db_write([("INSERT INTO attendance (store, time, name, action) VALUES (?, ?, ?, ?)", (get_store_key(), new_row["일시"], name, action))], f"attendance:{get_store_key()}")
+        bump_file_version(f"attendance:{get_store_key()}")
+        return
+    df = load_attendance()
     df = pd.concat([pd.DataFrame([new_row]), df], ignore_index=True)
     df.to_csv(get_csv_filename(), index=False)
+    perf_wrote(get_csv_filename())
+    bump_file_version(f"attendance:{get_store_key()}")
     return df
 
-# 게임 랭킹
+# 근무시간 계산 - 직원별·시간순으로 정렬한 출근/퇴근 기록을 NumPy 로 한 번에 짝지어 근무(shift)를 만들고
+# 일/주/월 근무시간, 연장(하루 8시간·주 40시간 초과), 야간(22~06시) 시간을 계산합니다.
+# 매장별 결과는 캐시에 두고, 새로 들어온 기록만 (근무 중인 출근 기록과 함께) 다시 짝짓습니다.
+DAILY_REGULAR_HOURS = 8
+WEEKLY_REGULAR_HOURS = 40
+NIGHT_START_HOUR, NIGHT_HOURS = 22, 8
+
+def shift_hours(names, starts, ends):
+    hour = np.timedelta64(1, 'h')
+    day = starts.astype('datetime64[D]')
+    night = np.zeros(len(starts))
+    for k in (-1, 0, 1):  # 전날 밤 / 당일 밤 / 다음날 밤 야간 구간과 겹치는 시간
+        night_start = day + np.timedelta64(k, 'D') + NIGHT_START_HOUR * hour
+        overlap = np.minimum(ends, night_start + NIGHT_HOURS * hour) - np.maximum(starts, night_start)
+        night += np.clip(overlap / hour, 0, None)
+    return pd.DataFrame({"직원명": names, "출근": starts, "퇴근": ends, "근무시간": (ends - starts) / hour, "야간시간": night})
+
+def pair_shifts(events):
+    ev = events.sort_values(['직원명', '일시'], kind='stable')
+    if ev.empty: return shift_hours(np.array([], dtype=object), *[np.array([], dtype='datetime64[ns]')] * 2), ev, ev
+    names = ev['직원명'].to_numpy()
+    times = ev['일시'].to_numpy()
+    is_in = (ev['구분'] == "출근").to_numpy()
+    same_next = np.append(names[:-1] == names[1:], False)
+    starts = np.flatnonzero(is_in & np.append(~is_in[1:], False) & same_next)
+    used = np.zeros(len(ev), dtype=bool)
+    used[starts] = used[starts + 1] = True
+    working = is_in & ~same_next  # 직원의 마지막 기록이 출근이면 아직 근무 중
+    return shift_hours(names[starts], times[starts], times[starts + 1]), ev[~used & ~working], ev[working]
+
+@st.cache_resource
+def get_shift_cache():
+    return {"lock": threading.Lock(), "stores": {}}
+
+@perf_timed
+def get_shift_state(filename, df_log):
+    cache = get_shift_cache()
+    with cache["lock"]:
+        state = cache["stores"].get(filename)
+        if state is None or state["events"] > len(df_log):
+            state = cache["stores"][filename] = {"events": 0, "shifts": None, "unpaired": None, "working": None, "summary": {}}
+        if state["events"] < len(df_log):
+            new = df_log.head(len(df_log) - state["events"]).iloc[::-1]  # 최신순 파일이라 새 기록은 위쪽
+            new = new.assign(일시=pd.to_datetime(new['일시'], format="%Y-%m-%d %H:%M", errors='coerce')).dropna(subset=['일시'])
+            shifts, unpaired, working = pair_shifts(pd.concat([state["working"], new]))
+            state["shifts"] = pd.concat([state["shifts"], shifts], ignore_index=True)
+            state["unpaired"] = pd.concat([state["unpaired"], unpaired])
+            state["working"] = working
+            state["events"] = len(df_log)
+            state["summary"] = {}
+        return state
+
+@perf_timed
+def payroll_summary(state, unit):
+    if unit in state["summary"]: return state["summary"][unit]
+    shifts = state["shifts"].assign(일자=state["shifts"]['출근'].dt.normalize())
+    daily = shifts.groupby(['직원명', '일자'])[['근무시간', '야간시간']].sum().reset_index()
+    daily['연장시간'] = (daily['근무시간'] - DAILY_REGULAR_HOURS).clip(lower=0)
+    if unit == "일":
+        out = daily.assign(일자=daily['일자'].dt.strftime("%Y-%m-%d")).rename(columns={'일자': '기간'})
+    else:
+        # 주 40시간 초과분 중 하루 단위 연장으로 안 잡힌 나머지는 그 주 마지막 근무일에 얹습니다.
+        # 월 합계도 이 값을 더하므로, 월 연장시간은 그 달에 끝난 주들의 주 단위 연장시간 합보다 작지 않습니다.
+        week = daily.groupby(['직원명', daily['일자'].dt.to_period("W")])
+        extra = (week['근무시간'].transform('sum') - WEEKLY_REGULAR_HOURS - week['연장시간'].transform('sum')).clip(lower=0)
+        last_day = daily['일자'] == week['일자'].transform('max')
+        daily = daily.assign(연장시간=daily['연장시간'] + extra.where(last_day, 0))
+        period = daily['일자'].dt.to_period("W" if unit == "주" else "M")
+        out = daily.assign(기간=period.dt.start_time.dt.strftime("%Y-%m-%d" if unit == "주" else "%Y-%m"))
+        out = out.groupby(['직원명', '기간'])[['근무시간', '야간시간', '연장시간']].sum().reset_index()
+    out = out.sort_values(['기간', '직원명'], ascending=[False, True]).round(2)
+    state["summary"][unit] = out[['기간', '직원명', '근무시간', '연장시간', '야간시간']]
+    return state["summary"][unit]
+
+# 테트리스 - components/tetris 폴더를 정적 컴포넌트로 띄우고, 게임이 끝나면 점수를 컴포넌트 값으로 받습니다.
+# 컴포넌트 이름에 파일 내용 해시를 붙여서, 브라우저는 JS/CSS 를 한 번만 받고 내용이 바뀔 때만 다시 받습니다.
+TETRIS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "tetris")
+
+@st.cache_resource
+def get_tetris_component():
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(TETRIS_DIR)):
+        with open(os.path.join(TETRIS_DIR, name), "rb") as f: digest.update(name.encode() + f.read())
+    return components.declare_component(f"tetris_{digest.hexdigest()[:12]}", path=TETRIS_DIR)
+
+# 게임 랭킹 - 이름→점수 해시와 점수순 정렬 목록(SortedList)을 메모리에 두고,
+# 갱신은 로그 파일에 한 줄씩 붙였다가 일정 건수마다 점수순 스냅샷(game_rank.csv)으로 합칩니다.
+# 재시작하면 이미 정렬된 스냅샷 + 짧은 로그만 읽으면 됩니다.
 GAME_FILE = "game_rank.csv"
+GAME_LOG_FILE = "game_rank_log.csv"
+GAME_COMPACT_ROWS = 1000
+
+# 다른 프로세스가 랭킹을 바꿨는지는 파일 상태(SQLite 는 버전)로 확인해서 바뀌었을 때만 다시 읽습니다.
+def rank_signature():
+    if STORAGE_BACKEND == "sqlite": return db_version("game_rank")
+    return file_signature(GAME_FILE), file_signature(GAME_LOG_FILE)
+
+def _read_leaderboard_files():
+    scores = {}
+    for path in [GAME_FILE, GAME_LOG_FILE]:
+        if not os.path.exists(path): continue
+        df = pd.read_csv(perf_read(path))
+        for name, score, date in zip(df['name'], df['score'], df['date']):
+            if name not in scores or score > scores[name][0]:
+                scores[name] = (int(score), date)
+    return scores
+
+@st.cache_resource
+def get_rank_state():
+    return {"lock": threading.Lock(), "board": None}
+
+@perf_timed
+def get_leaderboard():
+    state = get_rank_state()
+    with state["lock"]:
+        sig = rank_signature()
+        if state["board"] is None or state["board"]["sig"] != sig:
+            if STORAGE_BACKEND == "sqlite":
+                # 다른 프로세스가 점수를 쓸 때마다 다시 읽으므로 DataFrame 을 거치지 않습니다.
+                rows = db_conn().execute("SELECT name, score, date FROM game_rank").fetchall()
+                scores = {name: (int(score), date) for name, score, date in rows}
+                log_rows = 0
+            else:
+                scores = _read_leaderboard_files()
+                log_rows = len(pd.read_csv(perf_read(GAME_LOG_FILE))) if os.path.exists(GAME_LOG_FILE) else 0
+            order = SortedList((-score, name) for name, (score, _) in scores.items())
+            state["board"] = {"lock": threading.Lock(), "scores": scores, "order": order, "log_rows": log_rows, "sig": sig}
+        return state["board"]
+
 def load_rank():
-    if os.path.exists(GAME_FILE): return pd.read_csv(GAME_FILE)
-    return pd.DataFrame(columns=["name", "score", "date"])
+    board = get_leaderboard()
+    with board["lock"]:
+        rows = [(name, -neg, board["scores"][name][1]) for neg, name in board["order"]]
+    return pd.DataFrame(rows, columns=["name", "score", "date"])
+
+def top_scores(k=5):
+    board = get_leaderboard()
+    with board["lock"]:
+        return [(name, -neg) for neg, name in board["order"].islice(0, k)]
+
+def get_rank(name):
+    board = get_leaderboard()
+    with board["lock"]:
+        if name not in board["scores"]: return None
+        return board["order"].index((-board["scores"][name][0], name)) + 1, len(board["order"])
+
+@perf_timed
 def save_score(name, score):
-    df = load_rank()
-    if name in df['name'].values:
-        idx = df.index[df['name'] == name].tolist()[0]
-        if score > df.at[idx, 'score']:
-            df.at[idx, 'score'] = score
-            df.at[idx, 'date'] = datetime.now().strftime("%Y-%m-%d")
-    else:
-        new_row = {"name": name, "score": score, "date": datetime.now().strftime("%Y-%m-%d")}
-        df = pd.concat([pd.DataFrame([new_row]), df], ignore_index=True)
-    df.to_csv(GAME_FILE, index=False)
-    return df
+    board = get_leaderboard()
+    with board["lock"]:
+        old = board["scores"].get(name)
+        if old is not None and score <= old[0]: return
+        if old is not None: board["order"].remove((-old[0], name))
+        today = datetime.now().strftime("%Y-%m-%d")
+        board["scores"][name] = (int(score), today)
+        board["order"].add((-int(score), name))
+        if STORAGE_BACKEND == "sqlite":
+            db_write([("""INSERT INTO game_rank (name, score, date) VALUES (?, ?, ?)
+                          ON CONFLICT (name) DO UPDATE SET score = excluded.score, date = excluded.date
+                          WHERE excluded.score > game_rank.score""", (name, int(score), today))], "game_rank")
+            # 버전이 정확히 하나(이번 쓰기)만 올랐을 때만 메모리 랭킹이 최신이고, 그 사이 다른 프로세스가 썼으면 다음에 다시 읽습니다.
+            version = rank_signature()
+            board["sig"] = version if board["sig"] is not None and version == board["sig"] + 1 else None
+            return
+        # 파일 읽기(get_leaderboard)와 같은 잠금 안에서 붙이고 서명까지 바꿔서, 반쯤 쓴 로그를 읽거나 자기 쓰기를 남의 변경으로 보지 않습니다.
+        with get_rank_state()["lock"]:
+            fresh = rank_signature() == board["sig"]
+            before = file_size(GAME_LOG_FILE)
+            pd.DataFrame([{"name": name, "score": int(score), "date": today}]).to_csv(GAME_LOG_FILE, mode="a", header=not os.path.exists(GAME_LOG_FILE), index=False)
+            perf_wrote(GAME_LOG_FILE, before)
+            board["log_rows"] += 1
+            if board["log_rows"] >= GAME_COMPACT_ROWS:
+                rows = [(name, -neg, board["scores"][name][1]) for neg, name in board["order"]]
+                pd.DataFrame(rows, columns=["name", "score", "date"]).to_csv(GAME_FILE + ".tmp", index=False)
+                os.replace(GAME_FILE + ".tmp", GAME_FILE)
+                perf_wrote(GAME_FILE)
+                os.remove(GAME_LOG_FILE)
+                board["log_rows"] = 0
+            board["sig"] = rank_signature() if fresh else None
 
 # 전문가 DB - [수정됨] 초기 샘플 데이터 삭제
 EXPERT_FILE = "experts.csv"
+EXPERT_PAGE_SIZE = 10
+@perf_timed
 def load_experts():
-    if os.path.exists(EXPERT_FILE): return pd.read_csv(EXPERT_FILE)
+    return cached_load("experts", EXPERT_FILE, _db_read_experts if STORAGE_BACKEND == "sqlite" else _read_experts)
+def _db_read_experts():
+    return db_query("SELECT category, name, description AS desc, contact, location FROM experts ORDER BY seq DESC")
+def _read_experts():
+    if os.path.exists(EXPERT_FILE): return pd.read_csv(perf_read(EXPERT_FILE))
     # ⚠️ [수정] 개인정보 보호를 위해 초기 데이터는 비워둡니다.
     return pd.DataFrame(columns=["category", "name", "desc", "contact", "location"])
 
+@perf_timed
 def save_expert(category, name, desc, contact, location):
-    df = load_experts()
+    directory = get_expert_directory()
     new_row = {"category": category, "name": name, "desc": desc, "contact": contact, "location": location}
-    df = pd.concat([pd.DataFrame([new_row]), df], ignore_index=True)
-    df.to_csv(EXPERT_FILE, index=False)
+    if STORAGE_BACKEND == "sqlite":
+        db_write([("INSERT INTO experts (category, name, description, contact, location) VALUES (?, ?, ?, ?, ?)", (category, name, desc, contact, location))], "experts")
+        df = None
+    else:
+        df = pd.concat([pd.DataFrame([new_row]), load_experts()], ignore_index=True)
+        df.to_csv(EXPERT_FILE, index=False)
+        perf_wrote(EXPERT_FILE)
+    bump_file_version("experts")
+    with directory["lock"]: expert_index_add(directory, new_row)
     return df
 
-# -----------------------------------------------------------------------------
-# [메인] 앱 실행
-# -----------------------------------------------------------------------------
-set_style()
-track_visitor()
-total_visitors, _, df_visitors_all = get_visitor_count()
+# 전문가 찾기 - 분야/지역(시·도) 색인과 업체명·소개글 2-gram 색인을 메모리에 둡니다.
+# 번호(seq)는 등록 순서라서 최신순은 seq 역순이고, 새 등록은 해당 분야/지역/글자 조각 목록에만 추가됩니다.
+def expert_region(location):
+    parts = str(location).split()
+    return parts[0] if parts else "기타"
 
-if 'logged_in' not in st.session_state: st.session_state.logged_in = False
-if 'store_name' not in st.session_state: st.session_state.store_name = ""
+def expert_index_add(directory, row):
+    seq = len(directory["rows"])
+    row = {k: "" if pd.isna(v) else str(v) for k, v in row.items()}
+    directory["rows"].append(row)
+    directory["category"].setdefault(row["category"], []).append(seq)
+    directory["region"].setdefault(expert_region(row["location"]), []).append(seq)
+    for g in text_ngrams(row["name"].lower()) | text_ngrams(row["desc"].lower()):
+        directory["postings"].setdefault(g, array("i")).append(seq)
 
-# 로그인 화면
-if not st.session_state.logged_in:
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c2:
-        LOGO_URL = "https://cdn-icons-png.flaticon.com/512/1995/1995515.png" 
-        st.markdown(f"""<div class='login-box'><img src='{LOGO_URL}' style='width: 150px; margin-bottom: 20px; border-radius: 20px;'><p style='font-size: 1.1rem; font-weight: bold; color: #555;'>로그인</p></div>""", unsafe_allow_html=True)
-        with st.expander("📲 카톡에서 들어오셨나요?"):
-            st.markdown("**우측 하단 점 3개 → [다른 브라우저로 열기]**")
-        store_input = st.text_input("매장 이름")
-        pw_input = st.text_input("비밀번호 (4자리)", type="password")
-        if st.button("입장하기"):
-            if store_input in ["admin", "관리자"]:
-                if pw_input == ADMIN_PW:
-                    st.session_state.logged_in = True
-                    st.session_state.store_name = store_input
-                    st.rerun()
-                else: st.error("❌ 관리자 비밀번호가 틀렸습니다.")
-            elif store_input and pw_input:
-                st.session_state.logged_in = True
-                st.session_state.store_name = store_input
-                st.rerun()
-            else: st.warning("정보를 입력해주세요.")
-    st.markdown(f"<div style='text-align:center; color:#888; margin-top:20px;'>👀 현재 <b>{total_visitors:,}명</b>의 사장님이 함께하고 계십니다.</div>", unsafe_allow_html=True)
-    st.stop()
-
-# 메인 화면
-with st.sidebar:
-    st.write(f"👤 **{st.session_state.store_name}**님")
-    st.markdown(f"<div class='visitor-badge'>VISITORS<br>{total_visitors:,}</div>", unsafe_allow_html=True)
-    with st.expander("🕵️‍♂️ 접속 로그 (상세)"):
-        if not df_visitors_all.empty:
-            st.dataframe(df_visitors_all.sort_values("timestamp", ascending=False).head(10), hide_index=True)
-        else: st.write("기록 없음")
-    if st.button("로그아웃"):
-        st.session_state.logged_in = False
-        st.rerun()
-
-st.markdown(f"""<h1>🥕 사장님 비서<br><span class='store-subtitle'>({st.session_state.store_name})</span></h1>""", unsafe_allow_html=True)
-st.markdown("""<div class='install-guide'><b>💡 꿀팁:</b> 카톡 말고 <b>[다른 브라우저로 열기]</b> 후 <b>[홈 화면에 추가]</b> 하세요!</div>""", unsafe_allow_html=True)
+# 다른 세션/프로세스가 등록해서 건수가 달라지면 디렉터리를 다시 만듭니다.
+@st.cache_resource
+def get_expert_state():
+    return {"lock": threading.Lock(), "directory": None}
 
-# 공지사항
-current_notice = load_notice()
-if st.session_state.store_name in ["admin", "관리자"]:
-    with st.expander("📢 공지사항 수정 (관리자용)"):
-        new_notice = st.text_area("공지 내용", current_notice)
-        if st.button("공지 업데이트"):
-            save_notice(new_notice)
-            st.success("수정 완료!")
-            st.rerun()
+@perf_timed
+def get_expert_directory():
+    df = load_experts()
+    state = get_expert_state()
+    with state["lock"]:
+        if state["directory"] is None or len(state["directory"]["rows"]) != len(df):
+            directory = {"lock": threading.Lock(), "rows": [], "category": {}, "region": {}, "postings": {}}
+            for row in df.iloc[::-1].to_dict("records"):
+                expert_index_add(directory, row)
+            state["directory"] = directory
+        return state["directory"]
+
+def expert_facets():
+    directory = get_expert_directory()
+    with directory["lock"]:
+        return list(directory["category"]), sorted(directory["region"])
 
-st.markdown(f"""<div class='notice-box'><b>📢 필독 공지:</b> {current_notice}</div>""", unsafe_allow_html=True)
+@perf_timed
+def search_experts(category="전체", region="전체", text=""):
+    directory = get_expert_directory()
+    with directory["lock"]:
+        rows = directory["rows"]
+        seqs = None
+        if category != "전체": seqs = set(directory["category"].get(category, []))
+        if region != "전체":
+            in_region = set(directory["region"].get(region, []))
+            seqs = in_region if seqs is None else seqs & in_region
+        text = text.strip().lower()
+        if text:
+            grams = text_ngrams(text)
+            cand = set.intersection(*[set(directory["postings"].get(g, ())) for g in grams]) if grams else range(len(rows))
+            hits = {i for i in cand if text in rows[i]["name"].lower() or text in rows[i]["desc"].lower()}
+            seqs = hits if seqs is None else seqs & hits
+        if seqs is None: return list(range(len(rows) - 1, -1, -1))
+        return sorted(seqs, reverse=True)
 
-# 탭 설정
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs(["🏠 홈", "🔍 당근", "⏰ 근태", "🔥 보험점검", "📻 라디오", "📒 장부", "💰 쉼터", "🛠️ 전문가", "💧 배관/누수"])
+def expert_rows(seqs):
+    directory = get_expert_directory()
+    with directory["lock"]:
+        return [directory["rows"][i] for i in seqs]
 
-# ... (Tab 1 ~ 7 기존 코드) ...
-with tab1:
+# -----------------------------------------------------------------------------
+# [화면] 탭별 화면 - 각 탭은 fragment 라서 탭 안의 입력은 그 탭만 다시 그리고,
+# 메인에서는 선택된 탭 하나만 호출하므로 다른 탭의 파일 읽기/외부 조회/계산은 실행되지 않습니다.
+# -----------------------------------------------------------------------------
+@st.fragment
+@perf_tab
+def render_home():
     st.subheader("📰 오늘의 사장님 필수 뉴스")
     st.caption("※ 매일 09시, 12시, 18시, 21시 자동 업데이트")
-    news_list = get_real_google_news()
+    news_list, news_checked = get_real_google_news()
     if news_list:
+        keyword = st.radio("뉴스 키워드", ["전체"] + NEWS_KEYWORDS, horizontal=True, label_visibility="collapsed", key="news_keyword")
+        shown = news_list if keyword == "전체" else [n for n in news_list if keyword in n.get('keywords', [])]
         with st.container():
             st.markdown("<div class='news-box'>", unsafe_allow_html=True)
-            for news in news_list:
-                date_str = f"{news.published_parsed.tm_mon}/{news.published_parsed.tm_mday}"
-                st.markdown(f"<div class='news-item'><span style='color:#ff6f0f;'>●</span> <a href='{news.link}' target='_blank'>{news.title}</a> <span class='news-date'>{date_str}</span></div>", unsafe_allow_html=True)
+            for news in shown:
+                published = datetime.strptime(news['published'], "%Y-%m-%d %H:%M")
+                date_str = f"{published.month}/{published.day}"
+                tags = "".join(f"<span class='news-tag'>#{k}</span>" for k in news.get('keywords', []))
+                st.markdown(f"<div class='news-item'><span style='color:#ff6f0f;'>●</span> <a href='{news['link']}' target='_blank'>{news['title']}</a> <span class='news-date'>{date_str}</span>{tags}</div>", unsafe_allow_html=True)
+            if not shown: st.caption(f"'{keyword}' 관련 새 소식이 없습니다.")
             st.markdown("</div>", unsafe_allow_html=True)
-            now_str = datetime.now().strftime("%H시 %M분")
+            now_str = datetime.strptime(news_checked, "%Y-%m-%d %H:%M:%S").strftime("%H시 %M분")
             st.markdown(f"<div class='news-update-time'>최근 갱신: {now_str} 기준</div>", unsafe_allow_html=True)
+    else: st.info("뉴스를 불러오는 중입니다...")
     st.markdown("---")
     col_left, col_right = st.columns(2)
     with col_left:
@@ -361,13 +1784,22 @@ with tab1:
             for name, data in finance.items():
                 color = "red" if data['change'] > 0 else "blue"
                 sign = "▲" if data['change'] > 0 else "▼"
-                st.markdown(f"<div class='finance-box'><div class='finance-title'>{name}</div><div class='finance-val'>{data['price']:,.2f}</div><div class='finance-change' style='color:{color};'>{sign} {abs(data['change']):.2f} ({data['pct']:.2f}%)</div></div>", unsafe_allow_html=True)
+                trend = " · ".join(f"{label} {'▲' if v > 0 else '▼'}{abs(v):.1f}%" for label, v in [("1M", data.get('m1')), ("1Y", data.get('y1'))] if v is not None)
+                st.markdown(f"<div class='finance-box'><div class='finance-title'>{name}</div><div class='finance-val'>{data['price']:,.2f}</div><div class='finance-change' style='color:{color};'>{sign} {abs(data['change']):.2f} ({data['pct']:.2f}%)</div>{sparkline_svg(data.get('spark'), color)}<div class='finance-trend'>{trend}</div></div>", unsafe_allow_html=True)
         else: st.info("정보 로딩 중...")
     with col_right:
         st.subheader("🧮 스마트 매출 계산기")
         st.markdown("""<div class='metric-card'>고정비를 입력하면 <b>오늘 목표치</b>를 계산해드립니다.</div>""", unsafe_allow_html=True)
+        ledger_fixed = None
+        if st.checkbox("📒 장부의 실제 고정비 쓰기 (최근 3개월 평균)"):
+            store = get_store_key()
+            expense_items = ledger_expense_items(store)
+            if expense_items:
+                fixed_items = st.multiselect("고정비 항목", expense_items, default=[i for i in expense_items if any(h in i for h in FIXED_COST_HINTS)])
+                ledger_fixed = int(ledger_fixed_costs(store, fixed_items))
+            else: st.caption("장부에 지출 내역이 아직 없습니다.")
         c1, c2 = st.columns(2)
-        month_fixed = c1.number_input("월 고정비 합계", value=4500000, step=10000)
+        month_fixed = c1.number_input("월 고정비 합계", value=ledger_fixed if ledger_fixed is not None else 4500000, step=10000, disabled=ledger_fixed is not None)
         days = c2.number_input("영업 일수", value=30, step=1)
         if days > 0:
             daily_fixed = month_fixed / days
@@ -375,8 +1807,27 @@ with tab1:
             margin = st.slider("마진율 (%)", 10, 50, 25)
             target_sales = daily_fixed / (margin / 100)
             st.success(f"💰 오늘 목표 매출: **{int(target_sales):,}원** (BEP)")
+        with st.expander("📊 손익분기 시나리오 표 (고정비 × 영업 일수 × 마진율)"):
+            base = max(int(month_fixed), 10000)
+            fixed_range = st.slider("월 고정비 범위 (원)", 0, base * 3, (base // 2, base * 3 // 2), step=max(base // 100, 1000))
+            fixed_steps = st.select_slider("고정비 칸 수", [5, 10, 20, 50, 100], value=10)
+            days_range = st.slider("영업 일수 범위", 1, 31, (20, 31))
+            margin_range = st.slider("마진율 범위 (%)", 1, 90, (10, 50))
+            fixed_values, day_values, margin_values, grid = breakeven_grid(fixed_range, fixed_steps, days_range, margin_range)
+            day_pick = st.select_slider("영업 일수 보기", day_values.tolist(), value=int(min(max(days, day_values[0]), day_values[-1])))
+            table = pd.DataFrame(grid[:, day_pick - day_values[0], :].round(-2).astype("int64"),
+                                 index=pd.Index([f"{int(f):,}" for f in fixed_values], name="월 고정비"), columns=[f"{m}%" for m in margin_values])
+            import altair as alt
+            heat = table.reset_index().melt(id_vars="월 고정비", var_name="마진율", value_name="하루 목표 매출")
+            st.altair_chart(alt.Chart(heat).mark_rect().encode(
+                x=alt.X("마진율:O", sort=table.columns.tolist()), y=alt.Y("월 고정비:O", sort=table.index.tolist()),
+                color=alt.Color("하루 목표 매출:Q", scale=alt.Scale(scheme="orangered")), tooltip=["월 고정비", "마진율", alt.Tooltip("하루 목표 매출:Q", format=",")]),
+                use_container_width=True)
+            st.dataframe(table, use_container_width=True)
 
-with tab2:
+@st.fragment
+@perf_tab
+def render_daangn():
     st.markdown("### 🔍 당근마켓 전국 매물 찾기")
     keyword = st.text_input("찾으시는 물건", "")
     if st.button("전국 검색 시작"):
@@ -384,7 +1835,9 @@ with tab2:
             url = f"https://www.google.com/search?q=site:daangn.com {keyword}"
             st.markdown(f"<br><a href='{url}' target='_blank' style='background-color:#ff6f0f;color:white;padding:15px;display:block;text-decoration:none;border-radius:10px;font-weight:bold;text-align:center;'>👉 '{keyword}' 전국 매물 보기 (클릭)</a>", unsafe_allow_html=True)
 
-with tab3:
+@st.fragment
+@perf_tab
+def render_attendance():
     st.header(f"⏰ {st.session_state.store_name} 출퇴근부")
     c1, c2 = st.columns(2)
     emp_name = c1.text_input("직원 이름")
@@ -396,9 +1849,22 @@ with tab3:
             st.rerun()
     st.markdown("---")
     df_log = load_attendance()
-    if not df_log.empty: st.dataframe(df_log, use_container_width=True)
+    if not df_log.empty:
+        st.dataframe(df_log, use_container_width=True)
+        st.markdown("##### 📊 근무시간 집계")
+        shift_state = get_shift_state(get_csv_filename(), df_log)
+        unit = st.radio("집계 단위", ["일", "주", "월"], index=2, horizontal=True)
+        st.dataframe(payroll_summary(shift_state, unit), use_container_width=True, hide_index=True)
+        st.caption(f"※ 연장: 하루 {DAILY_REGULAR_HOURS}시간 초과분(주·월 단위는 주 {WEEKLY_REGULAR_HOURS}시간 초과분 포함), 야간: 22시~06시")
+        if not shift_state["working"].empty:
+            st.info("🟢 근무 중: " + ", ".join(shift_state["working"]['직원명'].astype(str)))
+        if not shift_state["unpaired"].empty:
+            with st.expander(f"⚠️ 짝이 맞지 않는 기록 {len(shift_state['unpaired'])}건 (출근/퇴근 누락)"):
+                st.dataframe(shift_state["unpaired"], use_container_width=True, hide_index=True)
 
-with tab4:
+@st.fragment
+@perf_tab
+def render_insurance():
     st.markdown("""<div class='event-box'><h3>☕ 스타벅스 100% 증정</h3><b>"상담만 받아도 조건 없이 드립니다!"</b></div>""", unsafe_allow_html=True)
     st.header("🔥 사장님, 보험료 1만 원 아끼려다 1억 날립니다.")
     st.markdown("""<div class='warning-box'><div class='warning-title'>🚨 혹시 이렇게 생각하시나요?</div><div class='warning-text'>"설마 우리 가게에 불이 나겠어?"<br>"건물주가 보험 들었으니 괜찮겠지?"<br><br><b>절대 아닙니다.</b><br>옆 가게로 불이 옮겨붙으면 <b>사장님이 100% 배상</b>해야 하고,<br>손님이 매장에서 미끄러져 다쳐도 <b>사장님 책임</b>입니다.</div></div>""", unsafe_allow_html=True)
@@ -423,7 +1889,9 @@ with tab4:
                 else: st.error(m)
             else: st.warning("정보를 입력하세요.")
 
-with tab5:
+@st.fragment
+@perf_tab
+def render_radio():
     st.header("📻 사장님 힐링 라디오")
     st.caption("오늘도 수고 많으셨습니다. 노래 들으면서 힘내세요! 💪")
     current_radio_url = load_radio_url()
@@ -441,7 +1909,9 @@ with tab5:
                 save_radio_url(new_url)
                 st.success("방송이 변경되었습니다! 모든 사장님들에게 이 영상이 송출됩니다."); st.rerun()
 
-with tab6:
+@st.fragment
+@perf_tab
+def render_ledger():
     st.header("📒 사장님 간편 장부")
     st.caption("복잡한 기능은 뺐습니다. **입력하고, 조회하고, 엑셀로 받으세요.**")
     with st.expander("✏️ 수입/지출 입력하기 (클릭)", expanded=False):
@@ -455,71 +1925,121 @@ with tab6:
             l_memo = st.text_input("메모", placeholder="특이사항")
             if st.form_submit_button("💾 장부에 저장"):
                 if l_item and l_amount > 0:
-                    save_ledger(l_date, l_type, l_item, l_amount, l_memo)
+                    save_ledger(get_store_key(), l_date, l_type, l_item, l_amount, l_memo)
                     st.success("저장되었습니다."); st.rerun()
                 else: st.warning("항목과 금액을 확인해주세요.")
+    with st.expander("📂 카드·은행 내역 한꺼번에 불러오기 (CSV/엑셀)", expanded=False):
+        upload = st.file_uploader("카드 단말기 매출내역이나 은행 거래내역 파일을 올려주세요.", type=["csv", "xlsx"])
+        if upload is not None:
+            skip_rows = st.number_input("제목줄 위에 건너뛸 줄 수", min_value=0, step=1)
+            try: preview = next(iter_import_chunks(upload, upload.name, skip_rows, nrows=5))
+            except Exception as e:
+                preview = None
+                st.error(f"파일을 읽지 못했습니다: {e}")
+            if preview is not None:
+                st.dataframe(preview, use_container_width=True, hide_index=True)
+                columns = list(preview.columns)
+                guess = guess_import_mapping(columns)
+                def pick(col, label, field, optional=False):
+                    options = ([None] if optional else []) + columns
+                    return col.selectbox(label, options, index=options.index(guess[field]) if guess[field] in options else 0,
+                                         format_func=lambda c: "(없음)" if c is None else c)
+                mapping = {"구분": st.radio("매출/지출 구분", IMPORT_TYPE_RULES, index=IMPORT_TYPE_RULES.index(guess["구분"]), horizontal=True)}
+                c1, c2, c3 = st.columns(3)
+                mapping["날짜"] = pick(c1, "날짜 열", "날짜")
+                mapping["항목"] = pick(c2, "항목 열", "항목", optional=True)
+                mapping["메모"] = pick(c3, "메모 열", "메모", optional=True)
+                c1, c2 = st.columns(2)
+                if mapping["구분"] == IMPORT_TYPE_RULES[3]:
+                    mapping["입금"] = pick(c1, "입금액 열", "입금")
+                    mapping["출금"] = pick(c2, "출금액 열", "출금")
+                else: mapping["금액"] = pick(c1, "금액 열", "금액")
+                if st.button("📥 장부로 불러오기"):
+                    status = st.empty()
+                    added, skipped = import_ledger_file(get_store_key(), upload, upload.name, mapping, skip_rows,
+                                                        progress=lambda read, added: status.caption(f"⏳ {read:,}줄 읽음 · {added:,}건 추가"))
+                    status.empty()
+                    st.success(f"{added:,}건을 장부에 추가했습니다. (이미 있거나 빈 줄 {skipped:,}건은 건너뜀)")
     st.markdown("---")
     st.subheader("🔍 장부 조회 & 엑셀 다운로드")
-    df_ledger = load_ledger()
-    if not df_ledger.empty:
+    store = get_store_key()
+    if ledger_row_count(store):
         c1, c2, c3 = st.columns([2, 1, 1])
         search_txt = c1.text_input("검색어 (항목, 메모)", placeholder="예: 식자재")
-        mask = df_ledger.apply(lambda x: search_txt in str(x['항목']) or search_txt in str(x['메모']), axis=1)
-        df_filtered = df_ledger[mask]
-        total_income = df_filtered[df_filtered['구분'] == "매출 (수입)"]['금액'].sum()
-        total_expense = df_filtered[df_filtered['구분'] == "지출 (비용)"]['금액'].sum()
+        search_dates = c2.date_input("기간", value=())
+        search_types = c3.multiselect("구분", ["매출 (수입)", "지출 (비용)"])
+        df_ledger = load_ledger(store, search_dates)
+        df_filtered = search_ledger(store, df_ledger, search_txt, search_dates, search_types)
+        ledger_rollup = get_ledger_rollup(store)
+        if search_txt.strip():
+            total_income = df_filtered[df_filtered['구분'] == "매출 (수입)"]['금액'].sum()
+            total_expense = df_filtered[df_filtered['구분'] == "지출 (비용)"]['금액'].sum()
+        else: total_income, total_expense = ledger_totals(ledger_rollup, search_dates, search_types)
         net_profit = total_income - total_expense
         c_a, c_b, c_c = st.columns(3)
         c_a.markdown(f"<div class='ledger-summary'><div class='ledger-label'>총 매출</div><div class='ledger-val' style='color:blue;'>{total_income:,}원</div></div>", unsafe_allow_html=True)
         c_b.markdown(f"<div class='ledger-summary'><div class='ledger-label'>총 지출</div><div class='ledger-val' style='color:red;'>{total_expense:,}원</div></div>", unsafe_allow_html=True)
         c_c.markdown(f"<div class='ledger-summary'><div class='ledger-label'>순이익</div><div class='ledger-val'>{net_profit:,}원</div></div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
-        st.dataframe(df_filtered, use_container_width=True, hide_index=True)
-        csv = df_filtered.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(label="📥 엑셀(CSV)로 내보내기", data=csv, file_name=f"사장님장부_{datetime.now().strftime('%Y%m%d')}.csv", mime='text/csv')
+        with st.expander("📈 월별 순이익 추이 & 항목별 합계"):
+            period = st.radio("기간", ["이번 달", "지난 12개월", "전체"], index=1, horizontal=True)
+            period_range = ledger_period(period)
+            monthly = ledger_monthly(ledger_rollup, period_range)
+            if not monthly.empty: st.bar_chart(monthly['순이익'])
+            st.dataframe(ledger_by_item(ledger_rollup, period_range), use_container_width=True, hide_index=True)
+        st.dataframe(df_filtered, use_container_width=True, hide_index=True, column_config={"날짜": st.column_config.DateColumn("날짜")})
+        c1, c2 = st.columns([1, 2])
+        export_fmt = c1.radio("파일 형식", list(EXPORT_FORMATS), horizontal=True, label_visibility="collapsed")
+        export_key = (store, search_txt.strip().lower(), str(search_dates), tuple(search_types), ledger_version(store))
+        ext, mime = EXPORT_FORMATS[export_fmt]
+        if ext == "xlsx" and len(df_filtered) > XLSX_MAX_ROWS: c2.warning("엑셀은 104만 줄까지만 담을 수 있습니다. 기간을 줄이거나 CSV로 받아주세요.")
+        else: c2.download_button(label=f"📥 {export_fmt}로 내보내기", data=lambda: ledger_export(export_key, export_fmt, df_filtered),
+                                 file_name=f"사장님장부_{datetime.now().strftime('%Y%m%d')}.{ext}", mime=mime)
     else: st.info("작성된 장부가 없습니다.")
 
-with tab7:
+@st.fragment
+@perf_tab
+def render_rest():
     st.header("💰 소상공인 정책자금 센터")
     st.markdown("""<div style='background-color:#e8f5e9; padding:20px; border-radius:15px; border:2px solid #4caf50; text-align:center;'><h3 style='color:#2e7d32; margin-bottom:10px;'>🏛️ 정책자금/대출 공식 신청 사이트</h3><p style='color:#333; margin-bottom:15px;'>소상공인시장진흥공단에서 제공하는 <b>저금리 정책자금</b>을 확인하세요.</p><a href='https://ols.semas.or.kr/ols/man/SMAN010M/page.do' target='_blank' style='background-color:#4caf50; color:white; padding:12px 25px; border-radius:30px; text-decoration:none; font-weight:bold; font-size:1.1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>🚀 정책자금 신청하러 가기 (클릭)</a></div>""", unsafe_allow_html=True)
     st.markdown("---")
     st.header("🎮 테트리스 챔피언십 (모바일용)")
-    st.caption("레벨 20까지 도전하세요! 500점마다 속도가 빨라집니다.")
-    tetris_code = """<!DOCTYPE html><html><head><meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no"><style>body{background-color:#202028;color:#fff;font-family:'Courier New',Courier,monospace;text-align:center;margin:0;padding:0;touch-action:manipulation}#game-container{position:relative;width:100%;max-width:350px;margin:0 auto}.hud{display:flex;justify-content:space-between;padding:10px;font-weight:bold;font-size:18px;color:#ff6f0f}canvas{display:block;background-color:#000;border:4px solid #444;margin:0 auto;box-shadow:0 0 20px rgba(0,0,0,0.5);width:100%;height:auto;image-rendering:pixelated}#overlay{position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);background:rgba(0,0,0,0.85);width:80%;padding:20px;border-radius:10px;border:2px solid #ff6f0f;display:flex;flex-direction:column;align-items:center;justify-content:center;z-index:10}.btn-start{background:#ff6f0f;color:white;border:none;padding:15px 30px;font-size:20px;font-weight:bold;border-radius:50px;cursor:pointer;margin-top:10px;box-shadow:0 4px 0 #b34e0a}.btn-start:active{transform:translateY(4px);box-shadow:none}.controls-area{margin-top:15px;display:flex;flex-direction:column;align-items:center;gap:10px;padding-bottom:20px}.d-pad{display:flex;gap:10px}.ctrl-btn{width:70px;height:70px;background:#444;border-radius:15px;border:none;color:white;font-size:30px;display:flex;align-items:center;justify-content:center;box-shadow:0 4px 0 #222;touch-action:manipulation;-webkit-tap-highlight-color:transparent}.ctrl-btn:active{background:#666;transform:translateY(4px);box-shadow:none}.rotate-btn{background:#2e7d32;width:80px;height:80px;border-radius:50%}.hidden{display:none!important}</style></head><body><div id="game-container"><div class="hud"><span>LV:<span id="level">1</span></span><span>SCORE:<span id="score">0</span></span></div><canvas id="tetris" width="240" height="400"></canvas><div id="overlay"><h2 id="msg-title" style="margin:0 0 10px 0;color:#fff">TETRIS</h2><p id="msg-sub" style="color:#aaa">사장님, 준비되셨나요?</p><div id="final-score-display" style="display:none;font-size:24px;color:#ff6f0f;margin:10px 0;font-weight:bold">0점</div><button class="btn-start" onclick="startGame()">GAME START</button></div></div><div class="controls-area"><button class="ctrl-btn rotate-btn" ontouchstart="playerRotate(1);return false;" onmousedown="playerRotate(1)">↻</button><div class="d-pad"><button class="ctrl-btn" ontouchstart="playerMove(-1);return false;" onmousedown="playerMove(-1)">⬅️</button><button class="ctrl-btn" ontouchstart="playerDrop();return false;" onmousedown="playerDrop()">⬇️</button><button class="ctrl-btn" ontouchstart="playerMove(1);return false;" onmousedown="playerMove(1)">➡️</button></div><div style="font-size:12px;color:#666;margin-top:5px">(PC는 방향키 사용 가능)</div></div><script>const canvas=document.getElementById('tetris');const context=canvas.getContext('2d');context.scale(20,20);let isGameOver=false;let isPaused=true;let dropInterval=1000;let lastTime=0;let dropCounter=0;let level=1;function arenaSweep(){let rowCount=1;outer:for(let y=arena.length-1;y>0;--y){for(let x=0;x<arena[y].length;++x){if(arena[y][x]===0)continue outer}const row=arena.splice(y,1)[0].fill(0);arena.unshift(row);++y;player.score+=rowCount*10;rowCount*=2}updateLevel()}function updateLevel(){const newLevel=Math.min(20,Math.floor(player.score/500)+1);if(newLevel!==level){level=newLevel;dropInterval=Math.max(100,1000-(level-1)*45)}document.getElementById('level').innerText=level;document.getElementById('score').innerText=player.score}function collide(arena,player){const m=player.matrix;const o=player.pos;for(let y=0;y<m.length;++y){for(let x=0;x<m[y].length;++x){if(m[y][x]!==0&&(arena[y+o.y]&&arena[y+o.y][x+o.x])!==0){return true}}}return false}function createMatrix(w,h){const matrix=[];while(h--){matrix.push(new Array(w).fill(0))}return matrix}function createPiece(type){if(type==='I')return[[0,1,0,0],[0,1,0,0],[0,1,0,0],[0,1,0,0]];else if(type==='L')return[[0,2,0],[0,2,0],[0,2,2]];else if(type==='J')return[[0,3,0],[0,3,0],[3,3,0]];else if(type==='O')return[[4,4],[4,4]];else if(type==='Z')return[[5,5,0],[0,5,5],[0,0,0]];else if(type==='S')return[[0,6,6],[6,6,0],[0,0,0]];else if(type==='T')return[[0,7,0],[7,7,7],[0,0,0]]}function drawMatrix(matrix,offset){matrix.forEach((row,y)=>{row.forEach((value,x)=>{if(value!==0){const colors=[null,'#FF0D72','#0DC2FF','#0DFF72','#F538FF','#FF8E0D','#FFE138','#3877FF'];context.fillStyle=colors[value];context.fillRect(x+offset.x,y+offset.y,1,1);context.lineWidth=0.05;context.strokeStyle='white';context.strokeRect(x+offset.x,y+offset.y,1,1)}})})}function draw(){context.fillStyle='#000';context.fillRect(0,0,canvas.width,canvas.height);drawMatrix(arena,{x:0,y:0});drawMatrix(player.matrix,player.pos)}function merge(arena,player){player.matrix.forEach((row,y)=>{row.forEach((value,x)=>{if(value!==0){arena[y+player.pos.y][x+player.pos.x]=value}})});if(player.pos.y===0)gameOver()}function rotate(matrix,dir){for(let y=0;y<matrix.length;++y){for(let x=0;x<y;++x){[matrix[x][y],matrix[y][x]]=[matrix[y][x],matrix[x][y]]}}if(dir>0)matrix.forEach(row=>row.reverse());else matrix.reverse()}function playerDrop(){if(isPaused||isGameOver)return;player.pos.y++;if(collide(arena,player)){player.pos.y--;merge(arena,player);playerReset();arenaSweep()}dropCounter=0}function playerMove(offset){if(isPaused||isGameOver)return;player.pos.x+=offset;if(collide(arena,player)){player.pos.x-=offset}}function playerReset(){const pieces='ILJOTSZ';player.matrix=createPiece(pieces[pieces.length*Math.random()|0]);player.pos.y=0;player.pos.x=(arena[0].length/2|0)-(player.matrix[0].length/2|0);if(collide(arena,player)){gameOver()}}function playerRotate(dir){if(isPaused||isGameOver)return;const pos=player.pos.x;let offset=1;rotate(player.matrix,dir);while(collide(arena,player)){player.pos.x+=offset;offset=-(offset+(offset>0?1:-1));if(offset>player.matrix[0].length){rotate(player.matrix,-dir);player.pos.x=pos;return}}}function update(time=0){if(!isPaused&&!isGameOver){const deltaTime=time-lastTime;lastTime=time;dropCounter+=deltaTime;if(dropCounter>dropInterval){playerDrop()}draw()}requestAnimationFrame(update)}function startGame(){arena.forEach(row=>row.fill(0));player.score=0;level=1;dropInterval=1000;isGameOver=false;isPaused=false;updateLevel();playerReset();document.getElementById('overlay').classList.add('hidden');update()}function gameOver(){isGameOver=true;document.getElementById('overlay').classList.remove('hidden');document.getElementById('msg-title').innerText="GAME OVER";document.getElementById('msg-sub').innerText="사장님의 최종 점수는?";const scoreEl=document.getElementById('final-score-display');scoreEl.style.display="block";scoreEl.innerText=player.score+" 점";document.querySelector('.btn-start').innerText="다시 시작하기"}const arena=createMatrix(12,20);const player={pos:{x:0,y:0},matrix:null,score:0};document.addEventListener('keydown',event=>{if(event.keyCode===37)playerMove(-1);else if(event.keyCode===39)playerMove(1);else if(event.keyCode===40)playerDrop();else if(event.keyCode===38)playerRotate(1)});playerReset();updateLevel();draw();</script></body></html>"""
-    components.html(tetris_code, height=850)
+    st.caption("레벨 20까지 도전하세요! 500점마다 속도가 빨라집니다. 게임이 끝나면 점수가 자동으로 랭킹에 등록됩니다.")
+    result = get_tetris_component()(key="tetris", default=None)
+    if result and result.get("game") != st.session_state.get("tetris_game"):
+        st.session_state.tetris_game = result["game"]
+        if int(result.get("score", 0)) > 0:
+            save_score(st.session_state.store_name, int(result["score"]))
+            st.success(f"축하합니다! {int(result['score']):,}점 등록 완료!")
     st.markdown("---")
-    st.subheader("🏆 랭킹 등록하기")
-    c1, c2 = st.columns([1, 1])
-    with c1:
-        st.info("👆 위 게임이 끝나면 **'GAME OVER'** 화면에 나온 점수를 아래에 입력해주세요.")
-        with st.form("game_score_submit"):
-            my_score = st.number_input("내 최종 점수", min_value=0, step=100)
-            if st.form_submit_button("🥇 점수 등록 및 랭킹 확인"):
-                if my_score > 0:
-                    save_score(st.session_state.store_name, my_score)
-                    st.success(f"축하합니다! {my_score}점 등록 완료!"); st.rerun()
-    with c2:
-        st.markdown("##### 🏅 명예의 전당 (Top 5)")
-        df_rank = load_rank()
-        if not df_rank.empty:
-            df_rank = df_rank.sort_values(by='score', ascending=False).head(5).reset_index(drop=True)
-            for i, row in df_rank.iterrows():
-                medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}위"
-                st.markdown(f"<div class='rank-card'><div><span class='rank-medal'>{medal}</span> <span class='rank-name'>{row['name']}</span></div><div class='rank-score'>{row['score']:,} 점</div></div>", unsafe_allow_html=True)
-        else: st.info("아직 랭커가 없습니다. 1등을 노리세요!")
-
-with tab8:
+    st.subheader("🏅 명예의 전당 (Top 5)")
+    top5 = top_scores(5)
+    if top5:
+        for i, (rank_name, rank_score) in enumerate(top5):
+            medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i+1}위"
+            st.markdown(f"<div class='rank-card'><div><span class='rank-medal'>{medal}</span> <span class='rank-name'>{rank_name}</span></div><div class='rank-score'>{rank_score:,} 점</div></div>", unsafe_allow_html=True)
+        my_rank = get_rank(st.session_state.store_name)
+        if my_rank: st.caption(f"🙋 내 순위: {my_rank[0]:,}위 / {my_rank[1]:,}명")
+    else: st.info("아직 랭커가 없습니다. 1등을 노리세요!")
+
+@st.fragment
+@perf_tab
+def render_experts():
     st.header("🛠️ 우리 동네 전문가 (숨고보다 싸다!)")
     st.markdown("견적 비용? 수수료? 없습니다. **사장님들끼리 직거래하세요!**")
     st.subheader("🔎 전문가 찾기")
-    df_experts = load_experts()
-    categories = ["전체"] + list(df_experts['category'].unique())
-    selected_cat = st.selectbox("어떤 전문가가 필요하신가요?", categories)
-    if selected_cat != "전체": df_show = df_experts[df_experts['category'] == selected_cat]
-    else: df_show = df_experts
-    if not df_show.empty:
-        for idx, row in df_show.iterrows():
-            st.markdown(f"""<div class='expert-card'><div class='expert-cat'>{row['category']} | {row['location']}</div><div class='expert-name'>{row['name']}</div><div class='expert-desc'>{row['desc']}</div><a href='tel:{row['contact']}' class='expert-contact'>📞 {row['contact']} (전화 걸기)</a></div>""", unsafe_allow_html=True)
+    expert_categories, expert_regions = expert_facets()
+    c1, c2 = st.columns(2)
+    selected_cat = c1.selectbox("어떤 전문가가 필요하신가요?", ["전체"] + expert_categories)
+    selected_region = c2.selectbox("지역", ["전체"] + expert_regions)
+    expert_query = st.text_input("업체명·소개글 검색", placeholder="예: 원상복구")
+    expert_seqs = search_experts(selected_cat, selected_region, expert_query)
+    if expert_seqs:
+        pages = (len(expert_seqs) - 1) // EXPERT_PAGE_SIZE + 1
+        page = st.number_input(f"페이지 (총 {pages}쪽 · {len(expert_seqs):,}명)", min_value=1, max_value=pages, value=1) if pages > 1 else 1
+        cards = [f"""<div class='expert-card'><div class='expert-cat'>{row['category']} | {row['location']}</div><div class='expert-name'>{row['name']}</div><div class='expert-desc'>{row['desc']}</div><a href='tel:{row['contact']}' class='expert-contact'>📞 {row['contact']} (전화 걸기)</a></div>"""
+                 for row in expert_rows(expert_seqs[(page - 1) * EXPERT_PAGE_SIZE:page * EXPERT_PAGE_SIZE])]
+        st.markdown("".join(cards), unsafe_allow_html=True)
     else: st.info("아직 등록된 전문가가 없습니다.")
     st.markdown("---")
     with st.expander("🙋‍♂️ 나도 전문가로 등록하기 (무료)"):
@@ -535,7 +2055,9 @@ with tab8:
                     st.success("등록되었습니다!"); st.rerun()
                 else: st.warning("정보를 입력하세요.")
 
-with tab9:
+@st.fragment
+@perf_tab
+def render_plumbing():
     st.header("💧 배관지킴이 (국가공인 배관관리사)")
     st.info("🧑‍🔧 **기도하 소장 직접 출동!** 타 업체가 못 잡은 누수, 제가 잡아드립니다.")
     c1, c2, c3 = st.columns(3)
@@ -553,10 +2075,132 @@ with tab9:
     st.markdown("<br><br>", unsafe_allow_html=True)
     st.success("✅ **국가공인 자격 보유** | ✅ **배상책임보험 가입 업체** | ✅ **카드 결제 환영**")
 
-# 👇 [하단 고정 버튼]
-st.markdown(f"""
-    <div class='sticky-footer'>
-        <a href='tel:{MY_PHONE}' class='footer-btn btn-call'>📞 전화 상담</a>
-        <a href='{MY_KAKAO_LINK}' target='_blank' class='footer-btn btn-kakao'>💬 카톡 문의</a>
-    </div>
-""", unsafe_allow_html=True)
+# 관리자 성능 패널 - 사이드바에서 켰을 때만 표를 만듭니다. (끄면 계측 기록만 쌓이고 계산은 하지 않습니다)
+@st.fragment
+def render_perf_panel():
+    with st.container(border=True):
+        st.subheader("⏱️ 성능 패널")
+        if not PERF_ENABLED:
+            st.info("DOHA_PERF=0 이라 계측이 꺼져 있습니다.")
+            return
+        c1, c2, c3 = st.columns(3)
+        c1.button("🔄 새로 고침", use_container_width=True)
+        c2.download_button("📥 JSONL 내보내기", data=perf_export_jsonl, file_name=f"perf_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+                           mime="application/jsonl", use_container_width=True)
+        if c3.button("🧹 기록 지우기", use_container_width=True): perf_reset()
+        st.markdown(f"**가장 느린 rerun** (최근 {PERF_RERUNS}회 중)")
+        st.dataframe(perf_slowest_reruns(), hide_index=True, use_container_width=True)
+        st.markdown(f"**구간별 시간** (이름별 최근 {PERF_SAMPLES}회, 데이터=함수 · 화면=탭 · 외부=yfinance/RSS/SMTP)")
+        st.dataframe(perf_percentiles(), hide_index=True, use_container_width=True)
+        c1, c2 = st.columns(2)
+        c1.markdown("**파일별 입출력**")
+        c1.dataframe(perf_io_stats(), hide_index=True, use_container_width=True)
+        c2.markdown("**파일 캐시 hit/miss**")
+        c2.dataframe(file_cache_stats(), hide_index=True, use_container_width=True)
+        if STORAGE_BACKEND == "sqlite": st.caption("SQLite 저장소는 파일별 바이트 대신 db_query/db_write 시간을 보세요.")
+
+TABS = {
+    "🏠 홈": render_home,
+    "🔍 당근": render_daangn,
+    "⏰ 근태": render_attendance,
+    "🔥 보험점검": render_insurance,
+    "📻 라디오": render_radio,
+    "📒 장부": render_ledger,
+    "💰 쉼터": render_rest,
+    "🛠️ 전문가": render_experts,
+    "💧 배관/누수": render_plumbing,
+}
+
+# -----------------------------------------------------------------------------
+# [메인] 앱 실행
+# -----------------------------------------------------------------------------
+def main():
+    st.set_page_config(
+        page_title="사장님 비서",
+        page_icon="🥕",
+        layout="wide",
+        initial_sidebar_state="collapsed"
+    )
+    set_style()
+    track_visitor()
+    start_news_scheduler()
+    if os.path.isdir(OUTBOX_DIR) and os.listdir(OUTBOX_DIR) and get_smtp_config(): get_mail_worker(get_smtp_config())
+    total_visitors, df_visitors_recent, visitor_stats = get_visitor_count()
+
+    if 'logged_in' not in st.session_state: st.session_state.logged_in = False
+    if 'store_name' not in st.session_state: st.session_state.store_name = ""
+
+    # 로그인 화면
+    if not st.session_state.logged_in:
+        st.markdown("<br><br>", unsafe_allow_html=True)
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            LOGO_URL = "https://cdn-icons-png.flaticon.com/512/1995/1995515.png" 
+            st.markdown(f"""<div class='login-box'><img src='{LOGO_URL}' style='width: 150px; margin-bottom: 20px; border-radius: 20px;'><p style='font-size: 1.1rem; font-weight: bold; color: #555;'>로그인</p></div>""", unsafe_allow_html=True)
+            with st.expander("📲 카톡에서 들어오셨나요?"):
+                st.markdown("**우측 하단 점 3개 → [다른 브라우저로 열기]**")
+            store_input = st.text_input("매장 이름")
+            pw_input = st.text_input("비밀번호 (4자리)", type="password")
+            if st.button("입장하기"):
+                if store_input in ["admin", "관리자"]:
+                    if pw_input == ADMIN_PW:
+                        st.session_state.logged_in = True
+                        st.session_state.store_name = store_input
+                        st.rerun()
+                    else: st.error("❌ 관리자 비밀번호가 틀렸습니다.")
+                elif store_input and pw_input:
+                    st.session_state.logged_in = True
+                    st.session_state.store_name = store_input
+                    st.rerun()
+                else: st.warning("정보를 입력해주세요.")
+        st.markdown(f"<div style='text-align:center; color:#888; margin-top:20px;'>👀 현재 <b>{total_visitors:,}명</b>의 사장님이 함께하고 계십니다.</div>", unsafe_allow_html=True)
+        st.stop()
+
+    # 메인 화면
+    with st.sidebar:
+        st.write(f"👤 **{st.session_state.store_name}**님")
+        st.markdown(f"<div class='visitor-badge'>VISITORS<br>{total_visitors:,}</div>", unsafe_allow_html=True)
+        with st.expander("🕵️‍♂️ 접속 로그 (상세)"):
+            if not df_visitors_recent.empty:
+                today_count = visitor_stats.get("daily", {}).get(datetime.now().strftime("%Y-%m-%d"), 0)
+                st.caption(f"오늘 {today_count:,}명 방문")
+                st.dataframe(df_visitors_recent, hide_index=True)
+            else: st.write("기록 없음")
+        if st.session_state.store_name in ["admin", "관리자"]:
+            with st.expander("🗂️ 파일 캐시 (관리자)"):
+                st.dataframe(file_cache_stats(), hide_index=True)
+            st.toggle("⏱️ 성능 패널 (관리자)", key="perf_panel")
+        if st.button("로그아웃"):
+            st.session_state.logged_in = False
+            st.rerun()
+
+    st.markdown(f"""<h1>🥕 사장님 비서<br><span class='store-subtitle'>({st.session_state.store_name})</span></h1>""", unsafe_allow_html=True)
+    st.markdown("""<div class='install-guide'><b>💡 꿀팁:</b> 카톡 말고 <b>[다른 브라우저로 열기]</b> 후 <b>[홈 화면에 추가]</b> 하세요!</div>""", unsafe_allow_html=True)
+
+    # 공지사항
+    current_notice = load_notice()
+    if st.session_state.store_name in ["admin", "관리자"]:
+        with st.expander("📢 공지사항 수정 (관리자용)"):
+            new_notice = st.text_area("공지 내용", current_notice)
+            if st.button("공지 업데이트"):
+                save_notice(new_notice)
+                st.success("수정 완료!")
+                st.rerun()
+
+    st.markdown(f"""<div class='notice-box'><b>📢 필독 공지:</b> {current_notice}</div>""", unsafe_allow_html=True)
+    if st.session_state.store_name in ["admin", "관리자"] and st.session_state.get("perf_panel"): render_perf_panel()
+
+    # 탭 설정 - 선택된 탭만 실행합니다.
+    active_tab = st.radio("메뉴", list(TABS), horizontal=True, label_visibility="collapsed", key="active_tab")
+    TABS[active_tab]()
+
+    # 👇 [하단 고정 버튼]
+    st.markdown(f"""
+        <div class='sticky-footer'>
+            <a href='tel:{MY_PHONE}' class='footer-btn btn-call'>📞 전화 상담</a>
+            <a href='{MY_KAKAO_LINK}' target='_blank' class='footer-btn btn-kakao'>💬 카톡 문의</a>
+        </div>
+    """, unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    with perf_rerun("전체"): main()
@@ -0,0 +1,295 @@
+# 벤치마크 - 가짜(합성) 데이터로 app.py 의 데이터 경로(장부, 방문자, 출퇴근, 랭킹, 전문가)를
+# 화면 없이 함수 단위로 재서 지연 시간(중앙값/p95)과 메모리(tracemalloc 최대치)를 JSON 으로 남깁니다.
+# 크기×저장소 조합마다 새 프로세스 + 빈 임시 폴더에서 돌리므로 캐시/메모리가 서로 섞이지 않습니다.
+# 데이터를 만드는 시간은 재지 않습니다. "cold" 는 프로세스 캐시를 비운 뒤(디스크 캐시는 그대로) 한 번 읽는 경우입니다.
+#
+# 사용법:
+#   python bench.py                                                  # 1만 행, csv
+#   python bench.py --rows 10000 1000000 --backend csv sqlite --out bench_results.json
+#   python bench.py --rows 10000000 --only ledger                    # 장부만
+#   python bench.py --compare old.json new.json                      # 커밋 간 비교 (느려지면 종료 코드 1)
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BENCH_STORE = "벤치가게"
+BENCH_GROUPS = ["ledger", "visitor", "attendance", "score", "experts"]
+BENCH_OTHER_STORES = 50  # 가게가 많을 때를 흉내 내는 다른 가게 수 (벤치 가게 행 수의 1/10 을 나눠 가짐)
+BENCH_IMPORT_ROWS = 10_000
+BENCH_SEED = 20240601
+
+INCOME_ITEMS = ["점심 매출", "저녁 매출", "배달 매출", "포장 매출", "카드 매출", "현금 매출", "단체 예약", "케이터링"]
+EXPENSE_ITEMS = ["식자재", "야채", "정육", "수산물", "주류", "음료", "쌀", "포장용기", "배달대행비", "카드수수료", "월세",
+                 "관리비", "전기요금", "가스요금", "수도요금", "인건비", "아르바이트 급여", "통신비", "광고비", "소모품",
+                 "세스코", "POS 사용료", "부가세", "보험료", "주방용품 수리"]
+MEMO_VENDORS = ["쿠팡", "이마트 트레이더스", "농협 하나로마트", "가락시장", "노량진 수산시장", "배달의민족", "요기요", "쿠팡이츠",
+                "현금", "카드", "계좌이체", "거래처 김사장", "거래처 박실장", "정기결제", "영수증 분실", "단골손님", "네이버 예약", ""]
+MEMO_SUFFIXES = ["", "", "", " 추가", " 환불", " 선결제", " 부가세 포함"] + [f" {m}월분" for m in range(1, 13)]
+SEARCH_QUERIES = ["식자재", "배달", "매출", "쿠팡", "월분", "김사장", "수수료", "가스", "요금", "환불"]
+SURNAMES = list("김이박최정강조윤장임한오서신권황안송류홍")
+GIVEN = list("민서지현준영수진하은도윤우주예성아연호경")
+NICKS = ["사장님", "떡볶이왕", "치킨러버", "국밥러", "알바천국", "테트리스장인", "야식킹", "커피중독", "새벽장사", "라떼는말야"]
+EXPERT_CATEGORIES = ["인테리어", "철거/원상복구", "용달/이사", "세무/회계", "마케팅/블로그", "기타"]
+EXPERT_REGIONS = ["서울 강남구", "서울 마포구", "서울 송파구", "경기 성남시", "경기 수원시", "인천 부평구", "부산 해운대구",
+                  "대구 수성구", "대전 유성구", "광주 서구", "제주 제주시"]
+EXPERT_WORDS = ["20년 경력", "무료 견적", "당일 시공", "카페 전문", "식당 전문", "야간 작업 가능", "원상복구 책임", "기장 대행",
+                "블로그 체험단", "사진 촬영", "간판 교체", "주방 설비", "폐업 정리", "소형 용달"]
+
+# 합성 데이터 - 한 번에 만들 수 있게 NumPy 로 고르고 pandas 문자열 연산으로 붙입니다.
+def person_names(rng, n):
+    return pd.Series(rng.choice(SURNAMES, n)) + pd.Series(rng.choice(GIVEN, n)) + pd.Series(rng.choice(GIVEN, n))
+
+def synth_ledger(rng, n, start_seq=0):
+    income = rng.random(n) < 0.35
+    items = np.where(income, rng.choice(INCOME_ITEMS, n), rng.choice(EXPENSE_ITEMS, n))
+    amounts = np.where(income, rng.integers(100, 30_000, n), rng.integers(50, 20_000, n)) * 100
+    memos = pd.Series(rng.choice(MEMO_VENDORS, n)) + pd.Series(rng.choice(MEMO_SUFFIXES, n))
+    dates = pd.Timestamp.today().normalize() - pd.to_timedelta(np.sort(rng.integers(0, 730, n))[::-1], unit="D")
+    return pd.DataFrame({"seq": np.arange(start_seq, start_seq + n), "날짜": dates.strftime("%Y-%m-%d"),
+                         "구분": np.where(income, "매출 (수입)", "지출 (비용)"), "항목": items, "금액": amounts, "메모": memos})
+
+# 카드/은행 내역 형식 (장부 불러오기용)
+def synth_card_export(rng, n):
+    rows = synth_ledger(rng, n)
+    amount = np.where(rows['구분'] == "매출 (수입)", rows['금액'], -rows['금액'])
+    df = pd.DataFrame({"거래일": rows['날짜'].str.replace("-", "."), "가맹점": rows['항목'], "금액": [f"{a:,}" for a in amount], "적요": rows['메모']})
+    return io.BytesIO(df.to_csv(index=False).encode("utf-8-sig"))
+
+# 직원마다 하루 한 번 출근/퇴근. 기간이 2년쯤 되도록 행 수에 맞춰 직원 수를 늘립니다.
+def synth_attendance(rng, n):
+    shifts = max(n // 2, 1)
+    staff = person_names(rng, max(8, shifts // 730)).drop_duplicates().tolist()
+    emp = np.arange(shifts) % len(staff)
+    day = np.arange(shifts) // len(staff)
+    start = pd.Timestamp.today().normalize() - pd.to_timedelta(day.max() - day + 1, unit="D") + pd.to_timedelta(rng.integers(7 * 60, 18 * 60, shifts), unit="min")
+    end = start + pd.to_timedelta(rng.integers(4 * 60, 10 * 60, shifts), unit="min")
+    names = np.array(staff)[emp]
+    df = pd.DataFrame({"일시": np.concatenate([start, end]), "직원명": np.concatenate([names, names]),
+                       "구분": ["출근"] * shifts + ["퇴근"] * shifts}).sort_values("일시", ascending=False, kind="stable")
+    return df.assign(일시=df['일시'].dt.strftime("%Y-%m-%d %H:%M")), staff
+
+def synth_visitors(rng, n):
+    ts = pd.Timestamp.now().floor("s") - pd.to_timedelta(np.sort(rng.integers(0, 365 * 86400, n))[::-1], unit="s")
+    return pd.DataFrame({"timestamp": ts.strftime("%Y-%m-%d %H:%M:%S"), "date": ts.strftime("%Y-%m-%d")})
+
+def synth_scores(rng, n):
+    names = pd.Series(rng.choice(NICKS, n)) + pd.Series(np.arange(n)).astype(str)
+    df = pd.DataFrame({"name": names, "score": rng.integers(0, 50_000, n) * 10, "date": datetime.now().strftime("%Y-%m-%d")})
+    return df.sort_values("score", ascending=False)
+
+def synth_experts(rng, n):
+    words = [pd.Series(rng.choice(EXPERT_WORDS, n)) for _ in range(3)]
+    return pd.DataFrame({"category": rng.choice(EXPERT_CATEGORIES, n),
+                         "name": person_names(rng, n) + pd.Series(rng.choice([" 인테리어", " 설비", " 세무사무소", " 익스프레스", " 디자인"], n)),
+                         "desc": words[0] + ", " + words[1] + ", " + words[2],
+                         "contact": pd.Series(rng.integers(1000, 9999, n)).map(lambda x: f"010-{x}-{x % 7919:04d}"),
+                         "location": rng.choice(EXPERT_REGIONS, n)})
+
+# 앱을 불러오기 전에 CSV 파일을 깔아 두면, SQLite 저장소는 처음 열 때 한 번 옮겨 담습니다.
+def seed_files(rng, rows, groups):
+    seeded = {}
+    if "visitor" in groups:
+        synth_visitors(rng, rows).to_csv("visitor_log.csv", index=False)
+    if "attendance" in groups:
+        df, staff = synth_attendance(rng, rows)
+        df.to_csv(f"log_{BENCH_STORE}.csv", index=False)
+        seeded["staff"] = staff
+        for i in range(BENCH_OTHER_STORES):
+            synth_attendance(rng, max(rows // 10 // BENCH_OTHER_STORES, 2))[0].to_csv(f"log_가게{i}.csv", index=False)
+    if "score" in groups:
+        df = synth_scores(rng, rows)
+        df.to_csv("game_rank.csv", index=False)
+        seeded["players"] = df['name'].tolist()
+    if "experts" in groups:
+        synth_experts(rng, rows).to_csv("experts.csv", index=False)
+    return seeded
+
+# 장부는 저장소별 파티션/테이블에 바로 씁니다. (가게마다 seq 는 0부터)
+def seed_ledger(app, rng, rows):
+    stores = [(BENCH_STORE, rows)] + [(f"가게{i}", max(rows // 10 // BENCH_OTHER_STORES, 1)) for i in range(BENCH_OTHER_STORES)]
+    if app.STORAGE_BACKEND == "sqlite":
+        conn = app.db_connect()
+        conn.execute("BEGIN")
+        for store, n in stores:
+            df = synth_ledger(rng, n)
+            conn.executemany("INSERT INTO ledger_entries (store, seq, date, type, item, amount, memo) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             ((store, int(s), d, t, i, int(a), m) for s, d, t, i, a, m in df.itertuples(index=False)))
+        conn.execute("COMMIT")
+        conn.close()
+        return
+    for store, n in stores:
+        os.makedirs(app.ledger_dir(store), exist_ok=True)
+        for path in app.write_ledger_partitions(store, synth_ledger(rng, n)): os.replace(path + ".tmp", path)
+
+# 캐시 비우기 - 파일 캐시의 해당 항목(부분 조회 포함)과 각 기능의 메모리 상태를 처음으로 돌립니다.
+def drop_cache(app, key):
+    cache = app.get_file_cache()
+    with cache["lock"]:
+        for k in [k for k in cache["entries"] if k == key or k.startswith(key + " ")]: del cache["entries"][k]
+
+def reset_ledger(app, store, index=False, rollup=False):
+    state = app.get_ledger_state()
+    with state["lock"]:
+        s = app.ledger_store_state(state, store)
+        if index: s["index"] = None
+        if rollup: s["rollup"] = None
+
+def bench_ops(app, rng, seeded):
+    st = app.st
+    store = BENCH_STORE
+    today = pd.Timestamp.today().normalize()
+    month = (today.replace(day=1).date(), today.date())
+    staff = seeded.get("staff", ["김민서"])
+    players = seeded.get("players", ["사장님0"])
+
+    def fresh_visit(): st.session_state.pop("visitor_counted", None)
+    def query(): return str(rng.choice(SEARCH_QUERIES))
+    state = {}
+    def prep_import(): state["file"] = synth_card_export(rng, BENCH_IMPORT_ROWS)
+    def run_import():
+        f = state["file"]
+        return app.import_ledger_file(store, f, "card.csv", app.guess_import_mapping(next(app.iter_import_chunks(f, "card.csv", nrows=5)).columns))
+    def clear_shifts(): app.get_shift_cache()["stores"].clear()
+    def clear_board(): app.get_rank_state()["board"] = None
+    def clear_experts(): drop_cache(app, "experts"); app.get_expert_state()["directory"] = None
+
+    # (묶음, 이름, 매번 재기 전에 부를 준비 함수, 잴 함수, 반복 횟수)
+    return [
+        ("ledger", "load_ledger.cold", lambda: drop_cache(app, f"ledger:{store}"), lambda: app.load_ledger(store), 5),
+        ("ledger", "load_ledger.warm", None, lambda: app.load_ledger(store), 50),
+        ("ledger", "load_ledger.month.cold", lambda: drop_cache(app, f"ledger:{store}"), lambda: app.load_ledger(store, month), 5),
+        ("ledger", "ledger_index.build", lambda: reset_ledger(app, store, index=True), lambda: app.get_ledger_index(store), 3),
+        ("ledger", "search_ledger.text", None, lambda: app.search_ledger(store, app.load_ledger(store), query()), 50),
+        ("ledger", "search_ledger.text+filters", None,
+         lambda: app.search_ledger(store, app.load_ledger(store, month), query(), month, ["지출 (비용)"]), 50),
+        ("ledger", "ledger_rollup.build", lambda: reset_ledger(app, store, rollup=True), lambda: app.get_ledger_rollup(store), 3),
+        ("ledger", "ledger_rollup.warm", None, lambda: app.get_ledger_rollup(store), 50),
+        ("ledger", "save_ledger", None, lambda: app.save_ledger(store, today, "지출 (비용)", str(rng.choice(EXPENSE_ITEMS)), 12_000, "벤치 입력"), 50),
+        ("ledger", "export_csv", None, lambda: app.export_csv(app.load_ledger(store)), 3),
+        ("ledger", f"import_ledger_file.{BENCH_IMPORT_ROWS}", prep_import, run_import, 3),
+        ("visitor", "track_visitor", fresh_visit, app.track_visitor, 50),
+        ("visitor", "get_visitor_count.cold", lambda: drop_cache(app, "visitor_stats"), app.get_visitor_count, 10),
+        ("visitor", "get_visitor_count.warm", None, app.get_visitor_count, 50),
+        ("attendance", "load_attendance.cold", lambda: drop_cache(app, f"attendance:{store}"), app.load_attendance, 5),
+        ("attendance", "load_attendance.warm", None, app.load_attendance, 50),
+        ("attendance", "save_attendance", None, lambda: app.save_attendance(str(rng.choice(staff)), str(rng.choice(["출근", "퇴근"]))), 20),
+        ("attendance", "shift_state.build", clear_shifts, lambda: app.get_shift_state(app.get_csv_filename(), app.load_attendance()), 3),
+        ("score", "leaderboard.build", clear_board, app.get_leaderboard, 5),
+        ("score", "save_score", None, lambda: app.save_score(f"벤치{rng.integers(1_000_000)}", int(rng.integers(0, 500_000))), 50),
+        ("score", "top_scores", None, lambda: app.top_scores(5), 50),
+        ("score", "get_rank", None, lambda: app.get_rank(str(rng.choice(players))), 50),
+        ("experts", "load_experts.cold", lambda: drop_cache(app, "experts"), app.load_experts, 5),
+        ("experts", "expert_directory.build", clear_experts, app.get_expert_directory, 3),
+        ("experts", "search_experts.text", None, lambda: app.search_experts(text=str(rng.choice(["경력", "견적", "카페", "세무", "용달"]))), 50),
+        ("experts", "search_experts.facets", None,
+         lambda: app.expert_rows(app.search_experts(str(rng.choice(EXPERT_CATEGORIES)), str(rng.choice(EXPERT_REGIONS)).split()[0])[:10]), 50),
+    ]
+
+def measure(prep, fn, repeat):
+    times = []
+    for _ in range(repeat):
+        if prep: prep()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    # 메모리는 시간과 따로 한 번 더 돌려서 잽니다. (tracemalloc 이 느려서)
+    if prep: prep()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    t = np.array(times)
+    return {"n": repeat, "min_ms": round(t.min(), 3), "median_ms": round(float(np.median(t)), 3),
+            "p95_ms": round(float(np.percentile(t, 95)), 3), "peak_kb": round(peak / 1024, 1)}
+
+# 자식 프로세스 - 저장소 환경 변수를 정한 뒤에 app 을 불러옵니다.
+def run_case(backend, rows, groups, workdir):
+    os.chdir(workdir)
+    os.environ.update({"DOHA_STORAGE": backend, "DOHA_DB": os.path.join(workdir, "bench.db"), "MARKET_PROVIDER": "stub"})
+    rng = np.random.default_rng(BENCH_SEED)
+    t0 = time.perf_counter()
+    seeded = seed_files(rng, rows, groups)
+    import logging
+    logging.disable(logging.WARNING)  # 화면 없이 부르면 streamlit 이 "No runtime found" 경고를 냅니다
+    import app
+    if backend == "sqlite": app.db_conn()  # 처음 열 때 깔아 둔 파일을 옮겨 담음
+    if "ledger" in groups: seed_ledger(app, rng, rows)
+    if "visitor" in groups and backend != "sqlite":
+        app.write_json_atomic(app.VISITOR_STATS_FILE, app._read_visitor_stats())
+    app.st.session_state.store_name = BENCH_STORE
+    seed_s = time.perf_counter() - t0
+    results = []
+    for group, op, prep, fn, repeat in bench_ops(app, rng, seeded):
+        if group not in groups: continue
+        r = {"backend": backend, "rows": rows, "group": group, "op": op, **measure(prep, fn, repeat)}
+        print(f"  {backend:>6} {rows:>10,} {op:<34} 중앙값 {r['median_ms']:>10.2f}ms  p95 {r['p95_ms']:>10.2f}ms  메모리 {r['peak_kb']:>10,.0f}KB", flush=True)
+        results.append(r)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"backend": backend, "rows": rows, "seed_s": round(seed_s, 2), "max_rss_mb": round(rss, 1)}, results
+
+def git_commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError: return ""
+
+def run_benchmarks(rows_list, backends, groups, out):
+    ctx = multiprocessing.get_context("spawn")
+    cases, results = [], []
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    for backend in backends:
+        for rows in rows_list:
+            with tempfile.TemporaryDirectory(prefix="doha_bench_") as workdir, ctx.Pool(1) as pool:
+                case, rs = pool.apply(run_case, (backend, rows, groups, workdir))
+            print(f"  {backend} {rows:,}행: 데이터 준비 {case['seed_s']}초, 최대 메모리(RSS) {case['max_rss_mb']:,}MB")
+            cases.append(case)
+            results += rs
+    meta = {"commit": git_commit(), "time": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "pandas": pd.__version__, "numpy": np.__version__, "platform": platform.platform(), "cpus": os.cpu_count()}
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "cases": cases, "results": results}, f, ensure_ascii=False, indent=1)
+    print(f"결과를 {out} 에 저장했습니다.")
+
+# 두 결과 파일에서 같은 (저장소, 행 수, 항목)끼리 중앙값을 비교합니다.
+def compare(old_path, new_path, threshold):
+    def load(path):
+        with open(path, encoding="utf-8") as f: data = json.load(f)
+        return data["meta"], {(r["backend"], r["rows"], r["op"]): r for r in data["results"]}
+    (old_meta, old), (new_meta, new) = load(old_path), load(new_path)
+    print(f"기준 {old_meta.get('commit') or old_path} → 비교 {new_meta.get('commit') or new_path} (중앙값 기준, {threshold:.2f}배 넘으면 표시)")
+    slower = 0
+    for key in sorted(old.keys() & new.keys()):
+        o, n = old[key], new[key]
+        ratio = n["median_ms"] / o["median_ms"] if o["median_ms"] else float("inf")
+        mark = "  ▲ 느려짐" if ratio > threshold else ("  ▽ 빨라짐" if ratio < 1 / threshold else "")
+        slower += ratio > threshold
+        print(f"  {key[0]:>6} {key[1]:>10,} {key[2]:<34} {o['median_ms']:>10.2f} → {n['median_ms']:>10.2f}ms  x{ratio:.2f}{mark}")
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"  {key[0]:>6} {key[1]:>10,} {key[2]:<34} 한쪽에만 있음")
+    return 1 if slower else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py 데이터 경로 벤치마크 (합성 데이터)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000], help="데이터 크기(행 수), 여러 개 가능")
+    parser.add_argument("--backend", nargs="+", default=["csv"], choices=["csv", "sqlite"])
+    parser.add_argument("--only", nargs="+", default=BENCH_GROUPS, choices=BENCH_GROUPS, help="잴 기능 묶음")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="두 결과 파일 비교")
+    parser.add_argument("--threshold", type=float, default=1.2, help="--compare 에서 느려짐으로 볼 배수")
+    args = parser.parse_args()
+    if args.compare: sys.exit(compare(*args.compare, args.threshold))
+    run_benchmarks(args.rows, args.backend, args.only, args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+// 테트리스 - Streamlit 컴포넌트로 띄우고, 게임이 끝나면 최종 점수를 컴포넌트 값으로 앱에 보냅니다.
+(function () {
+  "use strict";
+  var COLS = 12, ROWS = 20;
+  var COLORS = [null, "#FF0D72", "#0DC2FF", "#0DFF72", "#F538FF", "#FF8E0D", "#FFE138", "#3877FF"];
+  var PIECES = {
+    I: [[0, 1, 0, 0], [0, 1, 0, 0], [0, 1, 0, 0], [0, 1, 0, 0]],
+    L: [[0, 2, 0], [0, 2, 0], [0, 2, 2]],
+    J: [[0, 3, 0], [0, 3, 0], [3, 3, 0]],
+    O: [[4, 4], [4, 4]],
+    Z: [[5, 5, 0], [0, 5, 5], [0, 0, 0]],
+    S: [[0, 6, 6], [6, 6, 0], [0, 0, 0]],
+    T: [[0, 7, 0], [7, 7, 7], [0, 0, 0]]
+  };
+  var PIECE_NAMES = "ILJOTSZ";
+
+  var canvas = document.getElementById("tetris");
+  var context = canvas.getContext("2d");
+  context.scale(20, 20);
+  context.lineWidth = 0.05;
+  context.strokeStyle = "white";
+
+  var arena = createMatrix(COLS, ROWS);
+  var player = { pos: { x: 0, y: 0 }, matrix: null, score: 0 };
+  var isGameOver = false, isPaused = true;
+  var dropInterval = 1000, dropCounter = 0, lastTime = 0, level = 1, gameId = null;
+
+  // 화면에 그려진 칸(shown)과 이번에 그릴 칸(frame)을 비교해서 바뀐 칸만 다시 그립니다.
+  // 상태가 바뀌었을 때(dirty)만 비교하고, 프레임마다 새로 만드는 배열은 없습니다.
+  var frame = new Int8Array(COLS * ROWS);
+  var shown = new Int8Array(COLS * ROWS).fill(-1);
+  var dirty = true;
+
+  function send(type, data) {
+    var message = { isStreamlitMessage: true, type: type };
+    for (var k in data) message[k] = data[k];
+    window.parent.postMessage(message, "*");
+  }
+
+  function createMatrix(w, h) {
+    var matrix = [];
+    while (h--) matrix.push(new Array(w).fill(0));
+    return matrix;
+  }
+
+  function createPiece(type) {
+    return PIECES[type].map(function (row) { return row.slice(); });
+  }
+
+  function collide() {
+    var m = player.matrix, o = player.pos;
+    for (var y = 0; y < m.length; ++y) {
+      for (var x = 0; x < m[y].length; ++x) {
+        if (m[y][x] !== 0 && (arena[y + o.y] && arena[y + o.y][x + o.x]) !== 0) return true;
+      }
+    }
+    return false;
+  }
+
+  function draw() {
+    if (!dirty) return;
+    dirty = false;
+    var x, y, i;
+    for (y = 0; y < ROWS; ++y) {
+      for (x = 0; x < COLS; ++x) frame[y * COLS + x] = arena[y][x];
+    }
+    var m = player.matrix;
+    for (y = 0; y < m.length; ++y) {
+      for (x = 0; x < m[y].length; ++x) {
+        var ax = x + player.pos.x, ay = y + player.pos.y;
+        if (m[y][x] !== 0 && ay >= 0 && ay < ROWS && ax >= 0 && ax < COLS) frame[ay * COLS + ax] = m[y][x];
+      }
+    }
+    for (i = 0; i < frame.length; ++i) {
+      var value = frame[i];
+      if (value === shown[i]) continue;
+      shown[i] = value;
+      x = i % COLS;
+      y = (i / COLS) | 0;
+      context.fillStyle = value === 0 ? "#000" : COLORS[value];
+      context.fillRect(x, y, 1, 1);
+      if (value !== 0) context.strokeRect(x + 0.025, y + 0.025, 0.95, 0.95);
+    }
+  }
+
+  function updateLevel() {
+    var newLevel = Math.min(20, Math.floor(player.score / 500) + 1);
+    if (newLevel !== level) {
+      level = newLevel;
+      dropInterval = Math.max(100, 1000 - (level - 1) * 45);
+    }
+    document.getElementById("level").innerText = level;
+    document.getElementById("score").innerText = player.score;
+  }
+
+  function arenaSweep() {
+    var rowCount = 1;
+    outer: for (var y = arena.length - 1; y > 0; --y) {
+      for (var x = 0; x < arena[y].length; ++x) {
+        if (arena[y][x] === 0) continue outer;
+      }
+      var row = arena.splice(y, 1)[0].fill(0);
+      arena.unshift(row);
+      ++y;
+      player.score += rowCount * 10;
+      rowCount *= 2;
+    }
+    updateLevel();
+  }
+
+  function merge() {
+    player.matrix.forEach(function (row, y) {
+      row.forEach(function (value, x) {
+        if (value !== 0) arena[y + player.pos.y][x + player.pos.x] = value;
+      });
+    });
+    if (player.pos.y === 0) gameOver();
+  }
+
+  function rotate(matrix, dir) {
+    for (var y = 0; y < matrix.length; ++y) {
+      for (var x = 0; x < y; ++x) {
+        var t = matrix[x][y];
+        matrix[x][y] = matrix[y][x];
+        matrix[y][x] = t;
+      }
+    }
+    if (dir > 0) matrix.forEach(function (row) { row.reverse(); });
+    else matrix.reverse();
+  }
+
+  function playerReset() {
+    player.matrix = createPiece(PIECE_NAMES[PIECE_NAMES.length * Math.random() | 0]);
+    player.pos.y = 0;
+    player.pos.x = (COLS / 2 | 0) - (player.matrix[0].length / 2 | 0);
+    dirty = true;
+    if (collide()) gameOver();
+  }
+
+  function playerDrop() {
+    if (isPaused || isGameOver) return;
+    player.pos.y++;
+    if (collide()) {
+      player.pos.y--;
+      merge();
+      playerReset();
+      arenaSweep();
+    }
+    dropCounter = 0;
+    dirty = true;
+  }
+
+  function playerMove(offset) {
+    if (isPaused || isGameOver) return;
+    player.pos.x += offset;
+    if (collide()) player.pos.x -= offset;
+    else dirty = true;
+  }
+
+  function playerRotate(dir) {
+    if (isPaused || isGameOver) return;
+    var pos = player.pos.x, offset = 1;
+    rotate(player.matrix, dir);
+    while (collide()) {
+      player.pos.x += offset;
+      offset = -(offset + (offset > 0 ? 1 : -1));
+      if (offset > player.matrix[0].length) {
+        rotate(player.matrix, -dir);
+        player.pos.x = pos;
+        return;
+      }
+    }
+    dirty = true;
+  }
+
+  function update(time) {
+    if (!isPaused && !isGameOver) {
+      dropCounter += time - lastTime;
+      if (dropCounter > dropInterval) playerDrop();
+    }
+    lastTime = time;
+    draw();
+    requestAnimationFrame(update);
+  }
+
+  function startGame() {
+    arena.forEach(function (row) { row.fill(0); });
+    player.score = 0;
+    level = 1;
+    dropInterval = 1000;
+    dropCounter = 0;
+    isGameOver = false;
+    isPaused = false;
+    gameId = Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+    updateLevel();
+    playerReset();
+    document.getElementById("overlay").classList.add("hidden");
+  }
+
+  function gameOver() {
+    if (isGameOver) return;
+    isGameOver = true;
+    document.getElementById("overlay").classList.remove("hidden");
+    document.getElementById("msg-title").innerText = "GAME OVER";
+    document.getElementById("msg-sub").innerText = "사장님의 최종 점수는?";
+    var scoreEl = document.getElementById("final-score-display");
+    scoreEl.style.display = "block";
+    scoreEl.innerText = player.score + " 점";
+    document.getElementById("btn-start").innerText = "다시 시작하기";
+    send("streamlit:setComponentValue", { value: { game: gameId, score: player.score }, dataType: "json" });
+  }
+
+  var actions = {
+    rotate: function () { playerRotate(1); },
+    left: function () { playerMove(-1); },
+    right: function () { playerMove(1); },
+    drop: playerDrop
+  };
+  document.querySelectorAll(".ctrl-btn").forEach(function (button) {
+    var action = actions[button.dataset.action];
+    button.addEventListener("touchstart", function (event) { event.preventDefault(); action(); });
+    button.addEventListener("mousedown", action);
+  });
+  document.getElementById("btn-start").addEventListener("click", startGame);
+  document.addEventListener("keydown", function (event) {
+    if (event.keyCode === 37) playerMove(-1);
+    else if (event.keyCode === 39) playerMove(1);
+    else if (event.keyCode === 40) playerDrop();
+    else if (event.keyCode === 38) playerRotate(1);
+  });
+
+  playerReset();
+  updateLevel();
+  requestAnimationFrame(update);
+  send("streamlit:componentReady", { apiVersion: 1 });
+  send("streamlit:setFrameHeight", { height: document.documentElement.scrollHeight });
+})();
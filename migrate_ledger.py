@@ -0,0 +1,10 @@
+# 예전 단일 장부(ledger_data.csv 등)를 한 가게의 월별 파티션으로 한 번 옮기는 도구입니다.
+# 앱을 잠시 멈춘 상태에서 실행하세요.  사용법: python migrate_ledger.py <가게이름>
+import sys
+import app
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("사용법: python migrate_ledger.py <가게이름>")
+    store = app.store_key(sys.argv[1])
+    print(f"{app.migrate_legacy_ledger(store):,}건을 '{store}' 장부로 옮겼습니다.")
@@ -0,0 +1,111 @@
+# 테스트 공통 - app.py 를 화면 없이 불러와서, 테스트마다 빈 임시 폴더와 비운 cache_resource 로 함수 단위로 돌립니다.
+# 오래 걸리는 테스트(10만 건 입력, 여러 프로세스 부하)는 `python -m pytest --runslow` 로 돌릴 때만 실행합니다.
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+logging.disable(logging.WARNING)  # 화면 없이 부르면 streamlit 이 "No runtime found" 경고를 냅니다
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", help="오래 걸리는 테스트도 실행")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: --runslow 를 줄 때만 실행")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"): return
+    skip = pytest.mark.skip(reason="--runslow 를 주면 실행합니다")
+    for item in items:
+        if "slow" in item.keywords: item.add_marker(skip)
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import app as module
+    module.st.cache_resource.clear()
+    yield module
+    module.st.cache_resource.clear()
+
+# 로컬 RSS 서버 - 키워드(q)별 피드를 돌려주고, ETag/Last-Modified 가 같으면 304 를 줍니다. 받은 요청은 hits 에 남깁니다.
+RSS_LAST_MODIFIED = "Sat, 17 Oct 2026 12:00:00 GMT"
+
+def rss_item(title, link, published):
+    from email.utils import format_datetime
+    return f"<item><title>{title}</title><link>{link}</link><pubDate>{format_datetime(published)}</pubDate></item>"
+
+@pytest.fixture
+def rss_server(app, monkeypatch):
+    import http.server
+    import threading
+    from urllib.parse import parse_qs, urlparse
+
+    server_state = {"feeds": {}, "hits": [], "version": 0}
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            q = parse_qs(urlparse(self.path).query)["q"][0]
+            server_state["hits"].append({"q": q, "If-None-Match": self.headers.get("If-None-Match"),
+                                         "If-Modified-Since": self.headers.get("If-Modified-Since")})
+            etag = f"\"{q.encode().hex()}-{server_state['version']}\""
+            if self.headers.get("If-None-Match", etag) == etag and self.headers.get("If-Modified-Since") == RSS_LAST_MODIFIED:
+                self.send_response(304)
+                self.end_headers()
+                return
+            items = "".join(rss_item(*item) for item in server_state["feeds"].get(q, []))
+            body = f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel><title>{q}</title>{items}</channel></rss>".encode()
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", RSS_LAST_MODIFIED)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args): pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(app, "NEWS_URL", f"http://127.0.0.1:{server.server_port}/rss?q={{query}}")
+    yield server_state
+    server.shutdown()
+    server.server_close()
+
+# 로컬 SMTP 서버 - 받은 메일 원문을 messages 에 모읍니다. fail_data 에 응답 코드를 넣으면 DATA 를 그 코드로 거절합니다.
+@pytest.fixture
+def smtp_server():
+    import socketserver
+    import threading
+
+    server_state = {"messages": [], "fail_data": None}
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line):
+            self.wfile.write(line.encode() + b"\r\n")
+        def handle(self):
+            self.reply("220 localhost")
+            for line in self.rfile:
+                command = line.decode().strip().upper()
+                if command.startswith("QUIT"):
+                    self.reply("221 bye")
+                    return
+                if not command.startswith("DATA"):
+                    self.reply("250 ok")
+                    continue
+                if server_state["fail_data"]:
+                    self.reply(f"{server_state['fail_data']} try later")
+                    continue
+                self.reply("354 go ahead")
+                data = []
+                for line in self.rfile:
+                    if line == b".\r\n": break
+                    data.append(line)
+                server_state["messages"].append(b"".join(data).decode())
+                self.reply("250 queued")
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_state["config"] = ("127.0.0.1", server.server_address[1], "owner@example.com", "", False)
+    yield server_state
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,109 @@
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+
+STORE = "테스트가게"
+
+def wait_compacted(app, store):
+    while store in app.get_ledger_state()["compacting"]: time.sleep(0.05)
+
+def test_load_ledger_is_newest_first_across_journal_and_partitions(app, monkeypatch):
+    monkeypatch.setattr(app, "LEDGER_COMPACT_BYTES", 2_000)  # 몇십 건마다 봉인/합치기가 일어나게
+    for i in range(300):
+        app.save_ledger(STORE, date(2026, 1 + i % 3, 1 + i % 28), "지출 (비용)", f"항목{i}", 1000 + i, "메모")
+    wait_compacted(app, STORE)
+    assert app._ledger_partitions(STORE), "합친 월 파티션이 있어야 함"
+    df = app.load_ledger(STORE)
+    assert df.index.tolist() == list(range(299, -1, -1))
+    assert df['항목'].tolist() == [f"항목{i}" for i in range(299, -1, -1)]
+    assert app.ledger_row_count(STORE) == 300
+
+# 입력 한 건의 시간이 쌓인 행 수와 상관없이 일정해야 합니다. (처음 1천 건과 마지막 1천 건의 중앙값 비교)
+@pytest.mark.slow
+def test_insert_latency_is_flat_over_100k_entries(app):
+    n = 100_000
+    times = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        app.save_ledger(STORE, date(2026, 1 + i % 12, 1 + i % 28), "매출 (수입)", "점심 매출", 10_000, f"{i}번째")
+        times[i] = time.perf_counter() - t0
+    wait_compacted(app, STORE)
+    first, last = np.median(times[:1000]), np.median(times[-1000:])
+    print(f"처음 1천 건 중앙값 {first * 1000:.2f}ms, 마지막 1천 건 중앙값 {last * 1000:.2f}ms")
+    assert last < first * 3
+    assert app.ledger_row_count(STORE) == n
+    assert app.load_ledger(STORE).index[0] == n - 1
+
+# 합치기가 파티션을 바꾼 뒤 세그먼트를 지우기 전에 죽은 경우: 다시 띄워도, 다시 합쳐도 같은 seq 가 두 번 생기지 않아야 합니다.
+def test_compaction_rerun_after_crash_keeps_seq_unique(app, monkeypatch):
+    for i in range(50): app.save_ledger(STORE, date(2026, 1, 1 + i % 28), "매출 (수입)", f"항목{i}", 1000, "")
+    state = app.get_ledger_state()
+    with state["lock"]: app.seal_ledger_journal(state, STORE)
+    segments = app._ledger_segments(STORE)
+    written = app.write_ledger_partitions(STORE, app.pd.concat([app.read_ledger_csv(p) for p in segments], ignore_index=True))
+    for path in written: app.os.replace(path + ".tmp", path)  # 세그먼트는 지우지 못하고 멈춤
+    app.st.cache_resource.clear()  # 재시작
+    assert app.ledger_row_count(STORE) == 50
+    assert app.load_ledger(STORE).index.tolist() == list(range(49, -1, -1))
+    app.save_ledger(STORE, date(2026, 1, 2), "매출 (수입)", "재시작 후", 1000, "")
+    app.compact_ledger(STORE)
+    assert app._ledger_segments(STORE) == []
+    seqs = app.pd.concat([app.pd.read_parquet(p) for p in app._ledger_partitions(STORE)])["seq"]
+    assert sorted(seqs) == list(range(50))
+    df = app.load_ledger(STORE)
+    assert df.index.tolist() == list(range(50, -1, -1)) and df.loc[50, '항목'] == "재시작 후"
+    assert len(app.search_ledger(STORE, df, "항목1")) == 11
+
+# 숫자처럼 보이는 항목/메모("1234", 승인번호 "00123")도 저널 → 합치기 → 다시 읽기에서 글자 그대로 남아야
+# 합치기 스레드가 멈추지 않고, 같은 내역을 다시 불러올 때 중복으로 걸러집니다.
+def test_numeric_text_survives_compaction_and_reimport(app, monkeypatch):
+    import io
+    monkeypatch.setattr(app, "LEDGER_COMPACT_BYTES", 1_000)
+    for i in range(20): app.save_ledger(STORE, date(2026, 1, 5), "지출 (비용)", "1234", 100, "007")
+    card = "승인일,가맹점,승인금액,승인번호\n" + "".join(f"2026-02-{1 + i % 28:02d},{5000 + i},{1000 + i},{i:05d}\n" for i in range(200))
+    mapping = app.guess_import_mapping(["승인일", "가맹점", "승인금액", "승인번호"])
+    assert app.import_ledger_file(STORE, io.BytesIO(card.encode()), "card.csv", mapping) == (200, 0)
+    state = app.get_ledger_state()
+    with state["lock"]: start = os.path.exists(app._ledger_journal(STORE)) and app.seal_ledger_journal(state, STORE)
+    if start: app.compact_ledger(STORE)
+    wait_compacted(app, STORE)
+    assert app._ledger_segments(STORE) == [] and not os.path.exists(app._ledger_journal(STORE))
+    app.st.cache_resource.clear()
+    df = app.load_ledger(STORE)
+    assert len(df) == 220
+    assert (df.loc[range(20), '항목'] == "1234").all() and (df.loc[range(20), '메모'] == "007").all()
+    assert df.loc[20, '메모'] == "00000" and df.loc[219, '항목'] == "5199"
+    assert app.import_ledger_file(STORE, io.BytesIO(card.encode()), "card.csv", mapping) == (0, 200)
+    assert app.ledger_row_count(STORE) == 220
+
+# 기간별 조회 캐시는 가게마다 최근 FILE_CACHE_PARTS 개까지만 남고, 저장하면 예전 기간 조회는 버려져야 합니다.
+def test_ledger_range_cache_is_bounded(app):
+    app.save_ledger(STORE, date(2026, 1, 1), "지출 (비용)", "항목", 1000, "메모")
+    entries = app.get_file_cache()["entries"]
+    ranges = [(date(2025, m, 1), date(2026, 1, 1)) for m in range(1, 13)]
+    for r in ranges: app.load_ledger(STORE, r)
+    assert sum(k.startswith(f"ledger:{STORE} ") for k in entries) == app.FILE_CACHE_PARTS
+    assert len(app.load_ledger(STORE, ranges[-1])) == 1
+    assert app.file_cache_stats().set_index("파일").loc[f"ledger:{STORE} {app.ledger_months(ranges[-1])}", "hit"] == 1
+    app.save_ledger(STORE, date(2026, 1, 2), "지출 (비용)", "항목", 1000, "메모")
+    assert len(app.load_ledger(STORE, ranges[0])) == 2
+    assert [k for k in entries if k.startswith(f"ledger:{STORE} ")] == [f"ledger:{STORE} {app.ledger_months(ranges[0])}"]
+
+# 엑셀의 빈 칸은 "None" 글자가 아니라 빈 항목/메모로 들어와야 합니다.
+def test_xlsx_empty_cells_import_as_blank(app):
+    import io
+    import openpyxl
+    book = openpyxl.Workbook()
+    for row in [("승인일", "가맹점", "승인금액", "승인번호"), (date(2026, 3, 2), "편의점", 4500, None),
+                ("2026-03-03", None, "12,000", "00042"), (date(2026, 3, 4), None, None, None)]:
+        book.active.append(row)
+    file = io.BytesIO()
+    book.save(file)
+    mapping = app.guess_import_mapping(["승인일", "가맹점", "승인금액", "승인번호"])
+    assert app.import_ledger_file(STORE, file, "card.xlsx", mapping) == (2, 1)
+    df = app.load_ledger(STORE)
+    assert df['항목'].fillna("").tolist() == ["", "편의점"] and df['메모'].fillna("").tolist() == ["00042", ""]
+    assert df['금액'].tolist() == [12000, 4500]
@@ -0,0 +1,103 @@
+import email
+import email.header
+import json
+import os
+import threading
+import time
+
+import pytest
+
+class Stop(Exception):
+    pass
+
+class OnePass:
+    def wait(self, timeout=None): raise Stop
+    def set(self): pass
+    def clear(self): pass
+
+# 발송기를 한 바퀴만 돌립니다. (다 돌고 기다리려는 순간 멈춤)
+def run_worker_once(app, config):
+    with pytest.raises(Stop): app.mail_worker({"config": config, "wake": OnePass()})
+
+def enqueue(app, subject, **fields):
+    os.makedirs(app.OUTBOX_DIR, exist_ok=True)
+    path = os.path.join(app.OUTBOX_DIR, f"{time.time_ns()}.json")
+    app.write_json_atomic(path, {"subject": subject, "body": "본문", "attempts": 0, "next_try": 0, **fields})
+    return path
+
+def subjects(smtp_server):
+    return [str(email.header.make_header(email.header.decode_header(email.message_from_string(m)["Subject"])))
+            for m in smtp_server["messages"]]
+
+def test_due_messages_are_sent_and_removed(app, smtp_server):
+    enqueue(app, "첫 번째")
+    enqueue(app, "두 번째")
+    later = enqueue(app, "나중에", next_try=time.time() + 600)
+    run_worker_once(app, smtp_server["config"])
+    assert subjects(smtp_server) == ["첫 번째", "두 번째"]
+    assert os.listdir(app.OUTBOX_DIR) == [os.path.basename(later)]
+
+def test_failed_send_is_kept_with_backoff(app, smtp_server):
+    path = enqueue(app, "실패")
+    smtp_server["fail_data"] = 451
+    run_worker_once(app, smtp_server["config"])
+    with open(path, encoding="utf-8") as f: msg = json.load(f)
+    assert smtp_server["messages"] == []
+    assert msg["attempts"] == 1 and msg["error"]
+    assert msg["next_try"] > time.time() + app.OUTBOX_BASE_BACKOFF - 5
+
+def test_sent_message_is_not_rewritten_when_remove_fails(app, smtp_server, monkeypatch):
+    first = enqueue(app, "지우기 실패")
+    enqueue(app, "다음 메일")
+    claimed = f"{first}.sending.{os.getpid()}.{threading.get_ident()}"
+    remove = os.remove
+    def flaky_remove(path):
+        if path == claimed: raise PermissionError(path)
+        remove(path)
+    monkeypatch.setattr(app.os, "remove", flaky_remove)
+    run_worker_once(app, smtp_server["config"])
+    assert subjects(smtp_server) == ["지우기 실패", "다음 메일"]  # 실패로 처리해 멈추지 않고 다음 메일도 보냅니다
+    assert os.listdir(app.OUTBOX_DIR) == [os.path.basename(claimed)]  # 가져간 이름 그대로라 다시 보내지 않습니다
+    with open(claimed, encoding="utf-8") as f: msg = json.load(f)
+    assert msg["attempts"] == 0 and "error" not in msg
+
+def test_claims_of_live_processes_are_left_and_dead_ones_recovered(app, smtp_server):
+    import subprocess
+    import sys
+    dead = subprocess.Popen([sys.executable, "-c", ""])
+    dead.wait()
+    busy = enqueue(app, "다른 프로세스가 보내는 중")
+    os.rename(busy, f"{busy}.sending.{os.getppid()}.1")
+    orphan = enqueue(app, "죽은 프로세스가 남긴 것")
+    os.rename(orphan, f"{orphan}.sending.{dead.pid}.1")
+    restarted = enqueue(app, "같은 pid 로 재시작하기 전에 남은 것")
+    os.rename(restarted, f"{restarted}.sending.{os.getpid()}.1")
+    run_worker_once(app, smtp_server["config"])
+    assert sorted(subjects(smtp_server)) == sorted(["죽은 프로세스가 남긴 것", "같은 pid 로 재시작하기 전에 남은 것"])
+    assert os.listdir(app.OUTBOX_DIR) == [f"{os.path.basename(busy)}.sending.{os.getppid()}.1"]
+
+def test_concurrent_workers_send_each_message_once(app, smtp_server):
+    for i in range(60): enqueue(app, f"메일 {i}")
+    errors = []
+    def worker():
+        try: run_worker_once(app, smtp_server["config"])
+        except Exception as e: errors.append(e)
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert errors == []
+    assert sorted(subjects(smtp_server)) == sorted(f"메일 {i}" for i in range(60))
+    assert os.listdir(app.OUTBOX_DIR) == []
+
+def test_full_batch_waits_after_a_failure(app, smtp_server, monkeypatch):
+    for i in range(app.OUTBOX_BATCH + 5): enqueue(app, f"밀린 메일 {i}")
+    smtp_server["fail_data"] = 451
+    connects = []
+    smtp_connect = app.smtp_connect
+    def counting_connect(*args):
+        connects.append(args)
+        return smtp_connect(*args)
+    monkeypatch.setattr(app, "smtp_connect", counting_connect)
+    run_worker_once(app, smtp_server["config"])  # 실패하면 바로 다음 묶음으로 넘어가지 않고 기다리다 멈춤
+    assert len(connects) == 1
+    assert smtp_server["messages"] == []
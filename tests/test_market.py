@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+def test_second_refresh_asks_only_from_last_stored_date(app, monkeypatch):
+    calls = []
+    def recording(starts):
+        calls.append(dict(starts))
+        return app.stub_closes(starts)
+    monkeypatch.setitem(app.MARKET_PROVIDERS, "recording", recording)
+    monkeypatch.setenv("MARKET_PROVIDER", "recording")
+    symbols = set(app.MARKET_TICKERS.values())
+
+    app.refresh_finance_data()
+    backfill = pd.Timestamp.now().normalize() - pd.Timedelta(days=app.MARKET_BACKFILL_DAYS)
+    assert calls[0] == {symbol: backfill for symbol in symbols}
+    rows = {symbol: len(pd.read_parquet(app.market_history_path(symbol))) for symbol in symbols}
+    last = {symbol: pd.read_parquet(app.market_history_path(symbol))['date'].iloc[-1] for symbol in symbols}
+    assert all(n > 200 for n in rows.values())
+
+    app.refresh_finance_data()
+    assert calls[1] == last  # 마지막 저장 날짜부터만 (그날 봉은 다시 받아 덮어씀)
+    assert {symbol: len(pd.read_parquet(app.market_history_path(symbol))) for symbol in symbols} == rows
+    assert set(app.get_market_state()["snapshot"]["data"]) == set(app.MARKET_TICKERS)
+    assert sorted(os.listdir(app.MARKET_HISTORY_DIR)) == sorted(os.path.basename(app.market_history_path(s)) for s in symbols)
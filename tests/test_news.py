@@ -0,0 +1,114 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+BASE = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+
+def feed(prefix, n):
+    return [(f"{prefix} 소식 {i}번째 - 신문", f"http://n/{prefix}{i}", BASE - timedelta(hours=i)) for i in range(n)]
+
+def test_unchanged_feed_is_fetched_conditionally_and_returns_none(app, rss_server):
+    rss_server["feeds"]["세금"] = feed("세금", 3)
+    url = app.news_feed_url("세금")
+    first = app.fetch_news(url)
+    assert [item["link"] for item in first["items"]] == ["http://n/세금0", "http://n/세금1", "http://n/세금2"]
+    assert first["etag"] and first["modified"]
+    assert app.fetch_news(url, first["etag"], first["modified"]) is None
+    assert rss_server["hits"][-1]["If-None-Match"] == first["etag"]
+    assert rss_server["hits"][-1]["If-Modified-Since"] == first["modified"]
+    assert app.fetch_news(url, None, first["modified"]) is None  # ETag 없이 Last-Modified 만으로도 304
+    rss_server["version"] += 1
+    assert len(app.fetch_news(url, first["etag"], first["modified"])["items"]) == 3
+
+def test_snapshot_is_saved_and_reloaded_after_restart(app, rss_server):
+    for keyword in app.NEWS_KEYWORDS: rss_server["feeds"][keyword] = feed(keyword, 2)
+    app.refresh_news()
+    snapshot = app.get_news_state()["snapshot"]
+    assert len(snapshot["items"]) == 2 * len(app.NEWS_KEYWORDS)
+    app.st.cache_resource.clear()  # 프로세스 재시작과 같음
+    assert app.get_news_state()["snapshot"] == snapshot
+    rss_server["hits"].clear()
+    app.refresh_news()  # 다시 띄운 뒤에도 저장된 ETag 로 물어보고 304 를 받습니다
+    assert {hit["q"] for hit in rss_server["hits"]} == set(app.NEWS_KEYWORDS)
+    assert all(hit["If-None-Match"] for hit in rss_server["hits"])
+    assert app.get_news_state()["snapshot"]["items"] == snapshot["items"]
+
+def test_news_slots(app):
+    assert app.news_slots(datetime(2026, 10, 17, 10, 30)) == (datetime(2026, 10, 17, 9), datetime(2026, 10, 17, 12))
+    assert app.news_slots(datetime(2026, 10, 17, 2)) == (datetime(2026, 10, 16, 21), datetime(2026, 10, 17, 9))
+    assert app.news_slots(datetime(2026, 10, 17, 21)) == (datetime(2026, 10, 17, 21), datetime(2026, 10, 18, 9))
+
+class Slept(Exception):
+    pass
+
+def run_scheduler_once(app, monkeypatch):
+    sleeps = []
+    def sleep(seconds):
+        sleeps.append(seconds)
+        raise Slept
+    monkeypatch.setattr(app.time, "sleep", sleep)
+    with pytest.raises(Slept): app.news_scheduler()
+    return sleeps
+
+def test_scheduler_catches_up_after_missed_slot(app, rss_server, monkeypatch):
+    for keyword in app.NEWS_KEYWORDS: rss_server["feeds"][keyword] = feed(keyword, 2)
+    last_slot, next_slot = app.news_slots(datetime.now())
+    app.get_news_state()["snapshot"] = {"checked": (last_slot - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")}
+    sleeps = run_scheduler_once(app, monkeypatch)
+    assert len(rss_server["hits"]) == len(app.NEWS_KEYWORDS)  # 놓친 슬롯은 한 번만 따라잡습니다
+    assert app.get_news_state()["snapshot"]["checked"] >= last_slot.strftime("%Y-%m-%d %H:%M:%S")
+    assert sleeps[0] <= (next_slot - datetime.now()).total_seconds() + 1
+
+def test_scheduler_retries_sooner_when_refresh_fails(app, monkeypatch):
+    app.get_news_state()["snapshot"] = {}
+    def fail(): raise RuntimeError("피드 없음")
+    monkeypatch.setattr(app, "refresh_news", fail)
+    assert run_scheduler_once(app, monkeypatch)[0] <= app.NEWS_RETRY_SECONDS
+
+def test_syndicated_copy_keeps_canonical_published_time(app):
+    original = {"title": "소상공인 지원금 두 배 확대 - 한국일보", "link": "http://n/a", "published": "2026-10-17 09:00"}
+    copy = {"title": "[속보] 소상공인 지원금 두배 확대 - 연합뉴스", "link": "http://n/a-syn", "published": "2026-10-17 11:30"}
+    other = {"title": "자영업자 폐업 공제 확대 - 서울경제", "link": "http://n/d", "published": "2026-10-17 10:00"}
+    dedup = app.news_dedup_index([])
+    app.merge_news({"소상공인": {"items": [original]}}, dedup, "2026-10-17 09:05:00")
+    items = app.merge_news({"지원금": {"items": [copy]}, "자영업": {"items": [other]}}, dedup, "2026-10-17 12:00:00")
+    assert [(item["link"], item["published"]) for item in items] == [("http://n/d", "2026-10-17 10:00"), ("http://n/a", "2026-10-17 09:00")]
+    assert dedup["entries"][0]["published"] == "2026-10-17 09:00"
+
+def serve_keyword_feeds(app, rss_server):
+    for keyword in app.NEWS_KEYWORDS: rss_server["feeds"][keyword] = []
+    rss_server["feeds"]["세금"] = feed("세금", 12)
+    rss_server["feeds"]["소상공인"] = [("소상공인 지원금 두 배 확대 - 한국일보", "http://n/a", BASE - timedelta(hours=3)),
+                                   ("[속보] 소상공인 지원금 두배 확대 - 연합뉴스", "http://n/a-syn", BASE - timedelta(hours=2))]
+    rss_server["feeds"]["지원금"] = [("소상공인 지원금 두 배 확대 - 한국일보", "http://n/a", BASE - timedelta(hours=3))]
+
+def test_refresh_caps_keywords_and_collapses_duplicates(app, rss_server):
+    serve_keyword_feeds(app, rss_server)
+    app.refresh_news()
+    items = app.get_news_state()["snapshot"]["items"]
+    assert [item["link"] for item in items if item["keywords"] == ["세금"]] == [f"http://n/세금{i}" for i in range(app.NEWS_PER_KEYWORD)]
+    support = [item for item in items if "세금" not in item["keywords"]]
+    assert len(support) == 1
+    assert support[0]["link"] == "http://n/a" and support[0]["title"] == "소상공인 지원금 두 배 확대 - 한국일보"
+    assert sorted(support[0]["keywords"]) == ["소상공인", "지원금"]
+    assert support[0]["published"] == (BASE - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M")
+
+    rss_server["hits"].clear()
+    app.refresh_news()
+    assert len(rss_server["hits"]) == len(app.NEWS_KEYWORDS)
+    assert all(hit["If-None-Match"] for hit in rss_server["hits"])
+    assert app.get_news_state()["snapshot"]["items"] == items
+
+def test_fingerprints_survive_restart(app, rss_server):
+    serve_keyword_feeds(app, rss_server)
+    app.refresh_news()
+    assert os.path.exists(app.NEWS_DEDUP_FILE)
+    app.st.cache_resource.clear()
+    for keyword in app.NEWS_KEYWORDS: rss_server["feeds"][keyword] = []
+    rss_server["feeds"]["폐업"] = [("소상공인 지원금 두 배 확대 (종합) - 조선비즈", "http://n/a-late", BASE + timedelta(hours=1))]
+    rss_server["version"] += 1
+    app.refresh_news()
+    items = app.get_news_state()["snapshot"]["items"]
+    assert [(item["link"], item["keywords"]) for item in items] == [("http://n/a", ["폐업"])]
+    assert items[0]["published"] == (BASE - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M")
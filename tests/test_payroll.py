@@ -0,0 +1,31 @@
+import pandas as pd
+
+def attendance_log(shifts):
+    rows = []
+    for name, start, end in shifts:
+        rows += [{"일시": start, "직원명": name, "구분": "출근"}, {"일시": end, "직원명": name, "구분": "퇴근"}]
+    return pd.DataFrame(rows[::-1])  # 파일처럼 최신순
+
+def hours(df, name, period):
+    return df[(df['직원명'] == name) & (df['기간'] == period)].iloc[0]
+
+# 2026-01-26(월) ~ 2026-02-01(일) 주에 하루 7.5시간씩 6일 = 45시간: 하루 기준 연장은 없고 주 기준 연장 5시간
+SHIFTS = [("김알바", f"{d} 09:00", f"{d} 16:30") for d in
+          ["2026-01-26", "2026-01-27", "2026-01-28", "2026-01-29", "2026-01-30", "2026-01-31"]]
+SHIFTS += [("김알바", "2026-02-02 09:00", "2026-02-02 19:00")]  # 다음 주 하루 10시간: 하루 기준 연장 2시간
+
+def test_weekly_overtime_counts_hours_over_40(app):
+    state = app.get_shift_state("근태.csv", attendance_log(SHIFTS))
+    week = app.payroll_summary(state, "주")
+    assert hours(week, "김알바", "2026-01-26")['근무시간'] == 45
+    assert hours(week, "김알바", "2026-01-26")['연장시간'] == 5
+    assert hours(week, "김알바", "2026-02-02")['연장시간'] == 2
+    assert app.payroll_summary(state, "일")['연장시간'].sum() == 2
+
+def test_monthly_overtime_includes_weekly_overtime(app):
+    state = app.get_shift_state("근태.csv", attendance_log(SHIFTS))
+    week = app.payroll_summary(state, "주")
+    month = app.payroll_summary(state, "월")
+    assert hours(month, "김알바", "2026-01")['연장시간'] == 5  # 주 마지막 근무일(1/31)이 속한 달
+    assert hours(month, "김알바", "2026-02")['연장시간'] == 2
+    assert month['연장시간'].sum() == week['연장시간'].sum()
@@ -0,0 +1,191 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+
+import pytest
+
+def test_concurrent_atomic_json_writes_never_collide(app):
+    errors = []
+    def writer(n):
+        try:
+            for i in range(200): app.write_json_atomic("shared.json", {"writer": n, "i": i})
+        except Exception as e: errors.append(e)
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert errors == []
+    with open("shared.json", encoding="utf-8") as f: assert json.load(f)["i"] == 199
+
+def test_save_score_reloads_when_another_process_wrote_in_between(app, monkeypatch):
+    import sqlite3
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    app.save_score("가", 100)
+    assert app.top_scores() == [("가", 100)]
+    db_write = app.db_write
+    def racing_write(ops, *names):
+        db_write(ops, *names)
+        other = sqlite3.connect(app.DB_FILE)  # 이 쓰기 바로 뒤에 다른 프로세스가 쓴 것처럼
+        with other:
+            other.execute("INSERT INTO game_rank (name, score, date) VALUES ('나', 300, '2026-10-18')")
+            other.execute("UPDATE versions SET version = version + 1 WHERE name = 'game_rank'")
+        other.close()
+    monkeypatch.setattr(app, "db_write", racing_write)
+    app.save_score("다", 200)
+    assert app.top_scores() == [("나", 300), ("다", 200), ("가", 100)]
+
+def test_save_score_keeps_board_when_only_own_write_happened(app, monkeypatch):
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    app.save_score("가", 100)
+    board = app.get_leaderboard()
+    app.save_score("나", 200)
+    assert app.get_leaderboard() is board and board["sig"] == app.rank_signature()
+
+# 부하 테스트 - 프로세스 여러 개 x 스레드 여러 개가 같은 데이터(가계부, 방문자, 랭킹)에 동시에 씁니다.
+# SQLite 는 잃어버린 쓰기 없이 정확한 건수가 남아야 하고, CSV 는 한 프로세스에서 같은 일을 해서 처리량을 비교합니다.
+STRESS_STORE = "부하가게"
+
+class SessionPerCall:
+    def __init__(self, st): self._st = st
+    def __getattr__(self, name): return getattr(self._st, name)
+    @property
+    def session_state(self): return Session()  # 부를 때마다 새 세션이라 방문자 수가 매번 올라갑니다
+
+class Session(dict):
+    __setattr__ = dict.__setitem__
+
+def stress_worker(workdir, backend, worker, threads, ops, barrier, results):
+    os.chdir(workdir)
+    os.environ["DOHA_STORAGE"] = backend
+    os.environ["DOHA_PERF"] = "0"
+    import logging
+    logging.disable(logging.WARNING)
+    import app
+    app.st = SessionPerCall(app.st)
+    app.get_leaderboard()
+    errors, shared_seen = [], []
+    def run(t):
+        try:
+            best = 0
+            for i in range(ops):
+                app.save_ledger(STRESS_STORE, date(2026, 10, 1 + i % 28), "매출 (수입)", f"{worker}-{t}-{i}", 1000, "")
+                app.track_visitor()
+                app.save_score(f"{worker}-{t}", i)
+                app.save_score("공동", worker * 100_000 + t * 1000 + i)
+                if backend == "sqlite":
+                    score = app.db_conn().execute("SELECT score FROM game_rank WHERE name = '공동'").fetchone()[0]
+                    if score < best: shared_seen.append((best, score))
+                    best = score
+        except Exception as e: errors.append(repr(e))
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    barrier.wait()
+    start = time.perf_counter()
+    for th in pool: th.start()
+    for th in pool: th.join()
+    elapsed = time.perf_counter() - start
+    while STRESS_STORE in app.get_ledger_state()["compacting"]: time.sleep(0.05)
+    results.put({"elapsed": elapsed, "errors": errors, "decreased": shared_seen})
+
+def run_stress(workdir, backend, processes, threads, ops):
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(processes), ctx.Queue()
+    procs = [ctx.Process(target=stress_worker, args=(str(workdir), backend, w, threads, ops, barrier, results)) for w in range(processes)]
+    for p in procs: p.start()
+    out = [results.get(timeout=600) for _ in procs]
+    for p in procs: p.join(timeout=60)
+    assert [p.exitcode for p in procs] == [0] * processes
+    assert [e for r in out for e in r["errors"]] == []
+    return out
+
+def expected_scores(processes, threads, ops):
+    scores = {f"{w}-{t}": ops - 1 for w in range(processes) for t in range(threads)}
+    scores["공동"] = (processes - 1) * 100_000 + (threads - 1) * 1000 + ops - 1
+    return scores
+
+# 작은 경우는 프로세스 띄우는 비용이 커서 처리량은 큰 경우(--runslow)에서만 비교합니다.
+# 쓸 수 있는 CPU 가 프로세스 수보다 적으면 프로세스들이 번갈아 돌 뿐이라 비교하지 않습니다.
+def usable_cpus():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+@pytest.mark.parametrize("processes, threads, ops, compare_rate", [
+    (2, 2, 15, False),
+    pytest.param(4, 4, 150, True, marks=pytest.mark.slow),
+])
+def test_sqlite_stress_across_processes(app, tmp_path, monkeypatch, processes, threads, ops, compare_rate):
+    n = processes * threads * ops
+    sqlite_dir, csv_dir = tmp_path / "sqlite", tmp_path / "csv"
+    sqlite_dir.mkdir()
+    csv_dir.mkdir()
+    out = run_stress(sqlite_dir, "sqlite", processes, threads, ops)
+    assert [d for r in out for d in r["decreased"]] == []  # 공동 점수는 어느 프로세스에서 봐도 내려가지 않음
+    db = sqlite3.connect(sqlite_dir / "doha.db")
+    seqs = [s for s, in db.execute("SELECT seq FROM ledger_entries WHERE store = ? ORDER BY seq", (STRESS_STORE,))]
+    assert seqs == list(range(n))
+    items = {item for item, in db.execute("SELECT item FROM ledger_entries")}
+    assert items == {f"{w}-{t}-{i}" for w in range(processes) for t in range(threads) for i in range(ops)}
+    assert db.execute("SELECT COUNT(*) FROM visitors").fetchone()[0] == n
+    rollup = dict(db.execute("SELECT kind, SUM(count) FROM visitor_rollup GROUP BY kind").fetchall())
+    assert rollup == {"total": n, "daily": n, "hourly": n}
+    assert dict(db.execute("SELECT name, score FROM game_rank").fetchall()) == expected_scores(processes, threads, ops)
+    db.close()
+
+    # CSV 는 여러 프로세스를 지원하지 않으므로 같은 양을 한 프로세스(스레드 수는 전체 합)로 씁니다.
+    csv_out = run_stress(csv_dir, "csv", 1, processes * threads, ops)
+    sqlite_rate = n / max(r["elapsed"] for r in out)
+    csv_rate = n / csv_out[0]["elapsed"]
+    print(f"\n{processes}x{threads} 스레드, 스레드당 {ops}회: SQLite {sqlite_rate:.0f}회/초, CSV(1 프로세스) {csv_rate:.0f}회/초")
+    if compare_rate and usable_cpus() >= processes: assert sqlite_rate > csv_rate
+    monkeypatch.chdir(csv_dir)
+    assert app.ledger_row_count(STRESS_STORE) == n
+    assert app.load_ledger(STRESS_STORE).index.tolist() == list(range(n - 1, -1, -1))
+    assert app.load_visitor_stats()["total"] == n
+    assert dict(zip(app.load_rank()['name'], app.load_rank()['score'])) == expected_scores(1, processes * threads, ops)
+
+def test_sqlite_ledger_search_after_concurrent_saves(app, monkeypatch):
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    app.get_ledger_index("검색가게")  # 색인이 있는 상태에서 여러 세션이 동시에 씀
+    def saves(t):
+        for i in range(100):
+            app.save_ledger("검색가게", date(2026, 10, 1), "지출 (비용)", "사과" if (t + i) % 2 else "배", 1000, f"{t}-{i}")
+    threads = [threading.Thread(target=saves, args=(t,)) for t in range(4)]
+    for th in threads: th.start()
+    for th in threads: th.join()
+    df = app.load_ledger("검색가게")
+    found = app.search_ledger("검색가게", df, "사과")
+    assert len(found) == 200 and (found['항목'] == "사과").all()
+
+def test_csv_scores_saved_concurrently_with_reads(app, monkeypatch):
+    monkeypatch.setattr(app, "GAME_COMPACT_ROWS", 10)  # 로그를 자주 새로 만들어서 빈 로그 파일을 읽을 틈을 늘림
+    errors = []
+    def play(t):
+        try:
+            for i in range(150):
+                app.save_score(f"선수{t}", i)
+                app.load_rank()
+        except Exception as e: errors.append(repr(e))
+    threads = [threading.Thread(target=play, args=(t,)) for t in range(6)]
+    for th in threads: th.start()
+    for th in threads: th.join()
+    assert errors == []
+    board = app.get_leaderboard()
+    assert board["sig"] == app.rank_signature()  # 자기 쓰기만 있었으므로 다시 읽지 않은 상태
+    app.st.cache_resource.clear()
+    assert dict(zip(app.load_rank()['name'], app.load_rank()['score'])) == {f"선수{t}": 149 for t in range(6)}
+
+def test_csv_ledger_is_carried_into_a_new_sqlite_db(app, monkeypatch):
+    monkeypatch.setattr(app, "LEDGER_COMPACT_BYTES", 500)
+    for i in range(30): app.save_ledger("가게1", date(2026, 1 + i % 3, 1), "매출 (수입)", f"{i:04d}", 1000 + i, "" if i % 2 else "메모")
+    app.save_ledger("가게2", date(2026, 5, 1), "지출 (비용)", "재료", 300, "007")
+    while app.get_ledger_state()["compacting"]: time.sleep(0.05)
+    assert app._ledger_partitions("가게1")  # 파티션과 저널 양쪽에 행이 있는 상태
+    csv = {store: app.load_ledger(store) for store in ["가게1", "가게2"]}
+    monkeypatch.setattr(app, "STORAGE_BACKEND", "sqlite")
+    app.st.cache_resource.clear()
+    for store, df in csv.items():
+        assert app.ledger_row_count(store) == len(df)
+        app.pd.testing.assert_frame_equal(app.load_ledger(store), df, check_dtype=False)
+    app.save_ledger("가게2", date(2026, 5, 2), "지출 (비용)", "다음", 100, "")
+    assert app.load_ledger("가게2").index.tolist() == [1, 0]